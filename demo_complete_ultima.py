@@ -91,19 +91,13 @@ async def demo_complete_ultima_workflow():
     print(f"\n⚡ STEP 4: {best_agent.name} executes the task")
     print("-" * 50)
     
-    from src.agents.base_agent import Task, TaskStatus
-    from datetime import datetime
-    
-    task = Task(
-        id=task_def.task_id,
-        type="web_development",
-        description=task_def.parsed_data['description'],
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata=task_def.parsed_data['metadata'],
-        dependencies=[]
+    from src.agents.base_agent import Task
+    
+    task = Task.new(
+        "web_development",
+        task_def.parsed_data['description'],
+        task_def.parsed_data['metadata'],
+        task_id=task_def.task_id
     )
     
     print("🚀 Executing web development task...")
@@ -201,19 +195,13 @@ async def demo_real_time_monitoring():
     print("🔍 Running system health check...")
     
     # Create a simple diagnostic task
-    from src.agents.base_agent import Task, TaskStatus
-    from datetime import datetime
-    
-    monitor_task = Task(
-        id="system_monitor",
-        type="system_diagnostic",
-        description="Check system health and capabilities",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={},
-        dependencies=[]
+    from src.agents.base_agent import Task
+    
+    monitor_task = Task.new(
+        "system_diagnostic",
+        "Check system health and capabilities",
+        {},
+        task_id="system_monitor"
     )
     
     health_result = await diagnostic.execute_task(monitor_task)
@@ -6,9 +6,7 @@ Full System Diagnostic - RTX 3060 Optimized Check
 import asyncio
 from pathlib import Path
 from src.agents.diagnostic_agent import DiagnosticAgent
-from src.agents.base_agent import Task, TaskStatus
-import uuid
-from datetime import datetime
+from src.agents.base_agent import Task
 
 
 async def run_full_diagnostic():
@@ -21,16 +19,10 @@ async def run_full_diagnostic():
     
     # Full system check
     print("🔍 Running Full System Check...")
-    task = Task(
-        id=str(uuid.uuid4()),
-        type="system_check", 
-        description="Complete system health check",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={"include_recommendations": True},
-        dependencies=[]
+    task = Task.new(
+        "system_check",
+        "Complete system health check",
+        {"include_recommendations": True}
     )
     
     result = await agent.execute_task(task)
@@ -71,16 +63,10 @@ async def run_full_diagnostic():
     
     # GPU-specific analysis
     print(f"\n🎮 GPU-Specific Analysis...")
-    gpu_task = Task(
-        id=str(uuid.uuid4()),
-        type="gpu_check",
-        description="GPU analysis for AI workloads",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={"focus": "ai_model_compatibility"},
-        dependencies=[]
+    gpu_task = Task.new(
+        "gpu_check",
+        "GPU analysis for AI workloads",
+        {"focus": "ai_model_compatibility"}
     )
     
     gpu_result = await agent.execute_task(gpu_task)
@@ -100,16 +86,10 @@ async def run_full_diagnostic():
     
     # Performance check
     print(f"\n⚡ Performance Analysis...")
-    perf_task = Task(
-        id=str(uuid.uuid4()),
-        type="performance_check",
-        description="Current system performance",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={"include_recommendations": True},
-        dependencies=[]
+    perf_task = Task.new(
+        "performance_check",
+        "Current system performance",
+        {"include_recommendations": True}
     )
     
     perf_result = await agent.execute_task(perf_task)
@@ -127,16 +107,10 @@ async def run_full_diagnostic():
     
     # Software check
     print(f"\n🛠️ Software Dependencies...")
-    soft_task = Task(
-        id=str(uuid.uuid4()),
-        type="software_check",
-        description="Software dependency validation",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={},
-        dependencies=[]
+    soft_task = Task.new(
+        "software_check",
+        "Software dependency validation",
+        {}
     )
     
     soft_result = await agent.execute_task(soft_task)
@@ -11,8 +11,7 @@ import asyncio
 from pathlib import Path
 from src.cursor_bridge.task_detector import TaskDefinition
 from src.agents.web_agent import WebAgent
-from src.agents.base_agent import Task, TaskStatus
-from datetime import datetime
+from src.agents.base_agent import Task
 
 async def demo_password_generator():
     print("🔐 ULTIMA LIVE DEMO: Password Generator App")
@@ -33,15 +32,10 @@ async def demo_password_generator():
     # Step 3: Execute task
     print("🚀 ULTIMA is building your password generator...")
     
-    task = Task(
-        id=task_def.task_id,
-        type="web_development", 
-        description="Build a password generator with security options",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={
+    task = Task.new(
+        "web_development",
+        "Build a password generator with security options",
+        {
             "description": "Create a secure password generator with customizable options",
             "app_type": "password_generator",
             "features": [
@@ -53,7 +47,7 @@ async def demo_password_generator():
                 "Security recommendations"
             ]
         },
-        dependencies=[]
+        task_id=task_def.task_id
     )
     
     result = await web_agent.execute_task(task)
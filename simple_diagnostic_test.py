@@ -47,21 +47,13 @@ async def main():
     
     # Run a hardware check
     print(f"\n🔧 Hardware Check Results:")
-    from src.agents.base_agent import Task, TaskStatus
-    import uuid
-    from datetime import datetime
+    from src.agents.base_agent import Task
     
     # Create test task
-    task = Task(
-        id=str(uuid.uuid4()),
-        type="hardware_check",
-        description="Test hardware check",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={},
-        dependencies=[]
+    task = Task.new(
+        "hardware_check",
+        "Test hardware check",
+        {}
     )
     
     result = await agent.execute_task(task)
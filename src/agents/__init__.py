@@ -1,8 +1,26 @@
 # ULTIMA Agent Framework
 # Multi-agent orchestration system for autonomous development
 
+import functools
+from pathlib import Path
+
 from .base_agent import BaseAgent
 from .orchestrator import NeoOrchestrator
+from .ai_agent import AIAgent
+from .file_agent import FileAgent
+from .web_agent import WebAgent
+
+_AGENT_KINDS = {"ai": AIAgent, "file": FileAgent, "web": WebAgent}
+
+
+@functools.lru_cache(maxsize=None)
+def get_agent(kind: str, name: str, workspace_path: Path) -> BaseAgent:
+    """Shared agent per (kind, name, workspace), constructed on first use.
+    
+    Shared agents must not hold loop-bound resources past a stop(): AIAgent
+    builds its HTTP client per running loop and again after being stopped.
+    """
+    return _AGENT_KINDS[kind](name, workspace_path)
  
 __version__ = "0.1.0"
-__all__ = ["BaseAgent", "NeoOrchestrator"] 
\ No newline at end of file
+__all__ = ["BaseAgent", "NeoOrchestrator", "get_agent"] 
\ No newline at end of file
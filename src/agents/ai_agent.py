@@ -6,7 +6,7 @@ Optimized for RTX 3060 6GB + 16GB RAM systems
 
 import asyncio
 import json
-import requests
+import httpx
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 import re
@@ -38,14 +38,48 @@ class AIAgent(BaseAgent):
     - Multi-step reasoning
     """
     
+    # RTX 3060 VRAM budget; a model must fit entirely or Ollama spills layers to CPU
+    VRAM_BUDGET_MB = 6000
+    # Quantizations that keep 7B-14B models inside the budget, best first
+    QUANTIZATION_PREFERENCE = ("q4_k_m", "q4_0")
+    
     def __init__(self, name: str, workspace_path: Path):
         super().__init__(name, workspace_path)
         self.ollama_base_url = "http://localhost:11434"
+        # Async keep-alive client so concurrent tasks issue overlapping requests;
+        # built on first use in the running loop (see _http)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         self.models = {}
         self.current_model = None
+        # Models select_model() confirmed fit VRAM_BUDGET_MB; only these get every layer on the GPU
+        self._gpu_resident_models = set()
+        self._model_selected = False
+        # In-flight model lookup that concurrent first tasks all wait on
+        self._select_task: Optional[asyncio.Task] = None
         self._setup_models()
         self._setup_prompts()
     
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        """Client for the running loop; rebuilt after stop() or under a new loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.ollama_base_url,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def stop(self) -> None:
+        """Stop the agent and close its Ollama connection pool"""
+        await super().stop()
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+    
     def get_capabilities(self) -> List[str]:
         """Return capabilities this agent provides"""
         return [
@@ -99,6 +133,9 @@ class AIAgent(BaseAgent):
             if not await self._check_ollama():
                 return {"error": "Ollama service not available", "success": False}
             
+            if not self._model_selected:
+                await self._auto_select_model()
+            
             if task_type == "code_generation":
                 return await self._generate_code(metadata)
             elif task_type == "code_analysis":
@@ -118,11 +155,31 @@ class AIAgent(BaseAgent):
     async def _check_ollama(self) -> bool:
         """Check if Ollama service is running"""
         try:
-            response = requests.get(f"{self.ollama_base_url}/api/tags", timeout=5)
+            response = await self._http.get("/api/tags", timeout=5)
             return response.status_code == 200
         except:
             return False
     
+    async def _auto_select_model(self):
+        """Pick a VRAM-resident model once, from the models Ollama has pulled"""
+        # Concurrent first tasks share one lookup and all wait for its outcome
+        task = self._select_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._select_task = asyncio.ensure_future(self._select_from_ollama())
+        # One caller being cancelled must not cancel the lookup for the others
+        await asyncio.shield(task)
+    
+    async def _select_from_ollama(self):
+        try:
+            status = await self.get_model_status()
+            if self.select_model(status.get("models_info", {})) is None:
+                self.logger.warning(
+                    f"No Q4 model under {self.VRAM_BUDGET_MB} MB; keeping {self.current_model} with partial GPU offload"
+                )
+        finally:
+            # Only once the lookup is over, so nobody runs on the default model early
+            self._model_selected = True
+    
     async def _generate_llm_response(self, prompt: str, system_prompt: str = None, 
                                    max_tokens: int = None) -> Dict[str, Any]:
         """Generate response from local LLM"""
@@ -142,7 +199,8 @@ class AIAgent(BaseAgent):
                 "temperature": model_config.temperature,
                 "num_predict": max_tokens or model_config.max_tokens,
                 "num_ctx": 4096,  # RTX 3060 optimization
-                "num_gpu": 1,  # Use RTX 3060
+                # Layers to offload: all of them only when the model fits in VRAM
+                "num_gpu": 999 if model_name in self._gpu_resident_models else 1,
                 "num_thread": 8,  # Optimize for 12-core CPU
             }
         }
@@ -153,8 +211,8 @@ class AIAgent(BaseAgent):
         try:
             start_time = time.time()
             
-            response = requests.post(
-                f"{self.ollama_base_url}/api/generate",
+            response = await self._http.post(
+                "/api/generate",
                 json=payload,
                 timeout=120  # 2 minute timeout
             )
@@ -324,17 +382,27 @@ Provide:
                 }
             
             # Get available models
-            response = requests.get(f"{self.ollama_base_url}/api/tags")
+            response = await self._http.get("/api/tags", timeout=None)
             available_models = []
+            models_info = {}
             
             if response.status_code == 200:
                 models_data = response.json()
-                available_models = [model["name"] for model in models_data.get("models", [])]
+                for model in models_data.get("models", []):
+                    available_models.append(model["name"])
+                    models_info[model["name"]] = {
+                        "size_mb": model.get("size", 0) // (1024 * 1024),
+                        "quantization": model.get("details", {}).get("quantization_level", ""),
+                    }
             
+            current_info = models_info.get(self.current_model, {})
             return {
                 "ollama_status": "online",
                 "available_models": available_models,
+                "models_info": models_info,
                 "current_model": self.current_model,
+                "quantization": current_info.get("quantization"),
+                "vram_used_mb": current_info.get("size_mb"),
                 "rtx3060_optimized": True
             }
             
@@ -342,4 +410,36 @@ Provide:
             return {
                 "error": str(e),
                 "ollama_status": "error"
-            } 
\ No newline at end of file
+            } 
+    
+    def select_model(self, models_info: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """Switch to the largest Q4 model that fits VRAM_BUDGET_MB; None if nothing fits"""
+        
+        def quant_rank(name: str, info: Dict[str, Any]) -> int:
+            label = f"{info.get('quantization', '')} {name}".lower()
+            for rank, quant in enumerate(self.QUANTIZATION_PREFERENCE):
+                if quant in label:
+                    return rank
+            return -1
+        
+        candidates = [
+            (info["size_mb"], -quant_rank(name, info), name)
+            for name, info in models_info.items()
+            if quant_rank(name, info) >= 0 and 0 < info.get("size_mb", 0) < self.VRAM_BUDGET_MB
+        ]
+        if not candidates:
+            return None
+        
+        size_mb, _, name = max(candidates)
+        if name not in self.models:
+            self.models[name] = ModelConfig(
+                name=name,
+                max_tokens=4096,
+                temperature=0.7,
+                context_window=8192,
+                vram_usage_gb=round(size_mb / 1024, 1)
+            )
+        self.current_model = name
+        self._gpu_resident_models.add(name)
+        self._model_selected = True
+        return name
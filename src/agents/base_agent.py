@@ -6,13 +6,19 @@ All specialized agents inherit from this class.
 import asyncio
 import json
 import logging
+import uuid
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
 
 class TaskStatus(Enum):
     PENDING = "pending"
@@ -22,9 +28,9 @@ class TaskStatus(Enum):
     NEEDS_APPROVAL = "needs_approval"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Task:
-    """Basic task structure for agent communication"""
+    """Basic task structure for agent communication (immutable; see evolve)"""
     id: str
     type: str
     description: str
@@ -33,9 +39,30 @@ class Task:
     created_at: datetime
     updated_at: datetime
     metadata: Dict[str, Any]
-    dependencies: Optional[List[str]] = None
+    dependencies: Tuple[str, ...] = ()
     output_path: Optional[str] = None
     
+    @classmethod
+    def new(cls, task_type: str, description: str, metadata: Optional[Dict[str, Any]] = None,
+            task_id: Optional[str] = None, priority: int = 1,
+            created_at: Optional[datetime] = None) -> 'Task':
+        """Create a pending task stamped with created_at (default: the current time)"""
+        now = created_at or datetime.now()
+        return cls(
+            id=task_id or str(uuid.uuid4()),
+            type=task_type,
+            description=description,
+            priority=priority,
+            status=TaskStatus.PENDING,
+            created_at=now,
+            updated_at=now,
+            metadata=metadata or {},
+        )
+    
+    def evolve(self, **changes: Any) -> 'Task':
+        """Return a copy of the task with the given fields replaced"""
+        return replace(self, **changes)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary for JSON serialization"""
         data = asdict(self)
@@ -50,9 +77,24 @@ class Task:
         data['status'] = TaskStatus(data['status'])
         data['created_at'] = datetime.fromisoformat(data['created_at'])
         data['updated_at'] = datetime.fromisoformat(data['updated_at'])
+        data['dependencies'] = tuple(data.get('dependencies') or ())
         return cls(**data)
 
 
+def _dump_json(data: Any) -> bytes:
+    """Serialize data to indented JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _load_json(raw: bytes) -> Any:
+    """Parse JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 class BaseAgent(ABC):
     """
     Base class for all ULTIMA agents.
@@ -65,6 +107,8 @@ class BaseAgent(ABC):
         self.task_queue = asyncio.Queue()
         self.active_tasks: Dict[str, Task] = {}
         self.is_running = False
+        # Optional bus-fed FileWriter (see bus.py); set by the orchestrator
+        self.file_writer = None
 
         # Create agent-specific directories first (needed for file logging)
         self.agent_dir = workspace_path / "agents" / name
@@ -122,11 +166,10 @@ class BaseAgent(ABC):
         """Update task status and metadata"""
         if task_id in self.active_tasks:
             task = self.active_tasks[task_id]
-            task.status = status
-            task.updated_at = datetime.now()
-            
+            changes = {"status": status, "updated_at": datetime.now()}
             if metadata:
-                task.metadata.update(metadata)
+                changes["metadata"] = {**task.metadata, **metadata}
+            task = self.active_tasks[task_id] = task.evolve(**changes)
             
             # Save task state
             await self._save_task_state(task)
@@ -135,16 +178,22 @@ class BaseAgent(ABC):
     async def _save_task_state(self, task: Task) -> None:
         """Save task state to file"""
         task_file = self.tasks_dir / f"{task.id}.json"
-        with open(task_file, 'w') as f:
-            json.dump(task.to_dict(), f, indent=2)
+        # Serialize on the loop, write off it so slow disks don't stall other agents
+        await self._write_files([(task_file, _dump_json(task.to_dict()))])
+    
+    async def _write_files(self, files: List[Tuple[Path, bytes]]) -> None:
+        """Write (path, bytes) pairs off the loop, batched through the shared FileWriter when one is set"""
+        if self.file_writer is not None:
+            await self.file_writer.write_many(files)
+            return
+        await asyncio.gather(*(asyncio.to_thread(Path(path).write_bytes, data) for path, data in files))
     
     async def _load_task_state(self, task_id: str) -> Optional[Task]:
         """Load task state from file"""
         task_file = self.tasks_dir / f"{task_id}.json"
         if task_file.exists():
-            with open(task_file, 'r') as f:
-                data = json.load(f)
-                return Task.from_dict(data)
+            raw = await asyncio.to_thread(task_file.read_bytes)
+            return Task.from_dict(_load_json(raw))
         return None
     
     async def start(self) -> None:
@@ -6,15 +6,29 @@ Future: integrate PyInstaller to build executables.
 """
 
 import asyncio
-import subprocess
+import os
+import re
 import shutil
 import sys
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .base_agent import BaseAgent, Task, TaskStatus
 
 
+# app_name ends up in filesystem paths and PyInstaller argv
+_APP_NAME_RE = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$')
+_UNSAFE_NAME_CHARS_RE = re.compile(r'[^A-Za-z0-9_-]')
+
+# pip/PyInstaller can emit megabytes of output on failure
+_STDERR_LIMIT = 4096
+
+
+def _stderr_tail(stderr: bytes) -> str:
+    """Decode captured stderr only on the failure path, capped in size"""
+    return stderr[-_STDERR_LIMIT:].decode('utf-8', 'replace')
+
+
 HELLO_APP_TEMPLATE = """
 import tkinter as tk
 
@@ -84,18 +98,40 @@ if __name__ == "__main__":
 class DesktopAgent(BaseAgent):
     """Simple agent that scaffolds desktop applications."""
 
+    def __init__(self, name: str, workspace_path: Path):
+        super().__init__(name, workspace_path)
+        # PyInstaller builds peak at several hundred MB each, so bound concurrent
+        # spawns for the 16GB RAM target; pip installs are serialized because
+        # parallel runs contend on the same on-disk cache. Created per instance
+        # so they never get bound to another event loop.
+        self._spawn_sem = asyncio.Semaphore(max(2, (os.cpu_count() or 2) // 2))
+        self._pip_lock = asyncio.Lock()
+
     def get_capabilities(self):
         return ["desktop_application"]
 
+    async def _run(self, argv: List[str], cwd: Optional[Path] = None) -> Tuple[int, bytes]:
+        """Spawn argv directly (no shell) under the spawn semaphore; return (returncode, stderr)"""
+        async with self._spawn_sem:
+            proc = await asyncio.create_subprocess_exec(
+                *argv, cwd=cwd,
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+            )
+            stderr = await proc.stderr.read()
+            return await proc.wait(), stderr
+
     async def execute_task(self, task: Task) -> Optional[Dict]:
         """Create simple desktop app scaffold based on task description/metadata"""
         # Extract info from metadata or fallback
         app_name = task.metadata.get("app_name") if task.metadata else None
-        if not app_name:
-            # derive from description
-            app_name = task.description.replace(" ", "_")[:30] or "desktop_app"
+        if app_name:
+            if not _APP_NAME_RE.match(app_name):
+                return {"error": f"invalid app_name: {app_name!r}", "success": False}
+        else:
+            # derive from description, keeping only safe characters
+            app_name = _UNSAFE_NAME_CHARS_RE.sub("", task.description.replace(" ", "_"))[:30] or "desktop_app"
         app_dir = self.workspace_path / "workspace" / app_name
-        app_dir.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(os.makedirs, app_dir, exist_ok=True)
 
         # Decide template type
         template_type = (task.metadata.get("template") if task.metadata else None) or "auto"
@@ -104,17 +140,19 @@ class DesktopAgent(BaseAgent):
 
         if template_type == "cli":
             file_path = app_dir / "main.py"
-            file_path.write_text(CLI_APP_TEMPLATE.format(message="Hello from ULTIMA!"))
+            content = CLI_APP_TEMPLATE.format(message="Hello from ULTIMA!")
 
         elif template_type == "calculator" or "calculator" in description_lower:
             file_path = app_dir / "calculator.py"
             title = task.metadata.get("title", "Calculator") if task.metadata else "Calculator"
-            file_path.write_text(CALCULATOR_APP_TEMPLATE.format(title=title))
+            content = CALCULATOR_APP_TEMPLATE.format(title=title)
 
         else:  # default GUI hello template
             file_path = app_dir / "app.py"
             title = task.metadata.get("title", app_name) if task.metadata else app_name
-            file_path.write_text(HELLO_APP_TEMPLATE.format(title=title, message="Hello from ULTIMA!"))
+            content = HELLO_APP_TEMPLATE.format(title=title, message="Hello from ULTIMA!")
+
+        await self._write_files([(file_path, content.encode("utf-8"))])
 
         # Build standalone executable if possible (requires pyinstaller)
         executable_path = None
@@ -122,23 +160,23 @@ class DesktopAgent(BaseAgent):
             pyinstaller = shutil.which("pyinstaller")
             if not pyinstaller:
                 self.logger.info("PyInstaller not found, attempting installation via pip...")
-                try:
-                    # Retry with --break-system-packages flag for PEP 668 systems
-                    subprocess.check_call([sys.executable, "-m", "pip", "install", "--break-system-packages", "--quiet", "pyinstaller"])
-                except subprocess.CalledProcessError as e:
-                    self.logger.error(f"PyInstaller installation failed: {e}")
+                # Retry with --break-system-packages flag for PEP 668 systems
+                async with self._pip_lock:
+                    returncode, stderr = await self._run([sys.executable, "-m", "pip", "install", "--break-system-packages", "--quiet", "pyinstaller"])
+                if returncode:
+                    self.logger.error(f"PyInstaller installation failed: {_stderr_tail(stderr)}")
                 pyinstaller = shutil.which("pyinstaller")
 
             if pyinstaller:
-                try:
-                    # Use --onefile and place dist inside app_dir/dist
-                    cmd = [pyinstaller, "--onefile", "--noconsole", "--distpath", str(app_dir / "dist"), "--workpath", str(app_dir / "build"), "--specpath", str(app_dir), str(file_path.name)]
-                    subprocess.run(cmd, cwd=app_dir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                # Use --onefile and place dist inside app_dir/dist
+                cmd = [pyinstaller, "--onefile", "--noconsole", "--distpath", str(app_dir / "dist"), "--workpath", str(app_dir / "build"), "--specpath", str(app_dir), str(file_path.name)]
+                returncode, stderr = await self._run(cmd, cwd=app_dir)
+                if returncode:
+                    self.logger.error(f"PyInstaller packaging failed: {_stderr_tail(stderr)}")
+                else:
                     candidate = app_dir / "dist" / file_path.stem
                     if candidate.exists():
                         executable_path = candidate
-                except subprocess.CalledProcessError:
-                    self.logger.error("PyInstaller packaging failed")
             else:
                 self.logger.error("PyInstaller could not be installed; skipping executable packaging")
 
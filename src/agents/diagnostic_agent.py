@@ -38,6 +38,9 @@ class DiagnosticAgent(BaseAgent):
     - Performance monitoring and recommendations
     """
     
+    # Cached _check_nodejs result, shared by all instances
+    _nodejs_status: Optional[Tuple[bool, Dict[str, Any]]] = None
+    
     def __init__(self, name: str, workspace_path: Path):
         super().__init__(name, workspace_path)
         self.system_info = {}
@@ -334,7 +337,13 @@ class DiagnosticAgent(BaseAgent):
         return curl_path is not None, {"path": curl_path}
     
     def _check_nodejs(self) -> Tuple[bool, Dict[str, Any]]:
-        """Check Node.js installation"""
+        """Check Node.js installation (probed once per process)"""
+        if DiagnosticAgent._nodejs_status is None:
+            DiagnosticAgent._nodejs_status = self._probe_nodejs()
+        return DiagnosticAgent._nodejs_status
+    
+    def _probe_nodejs(self) -> Tuple[bool, Dict[str, Any]]:
+        """Locate node on PATH and read its version"""
         node_path = shutil.which("node")
         if node_path:
             try:
@@ -2,9 +2,8 @@
 File Agent - Handles file system operations for ULTIMA framework
 """
 
-import os
+import asyncio
 import shutil
-import subprocess
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
@@ -261,42 +260,34 @@ class FileAgent(BaseAgent):
         if not self._is_safe_path(repo_path):
             raise ValueError(f"Repository path not in safe zone: {repo_path}")
         
-        # Change to repository directory
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
+        if operation == "git_init":
+            cmd = ["git", "init"]
+        elif operation == "git_add":
+            files = metadata.get("files", ["."])
+            cmd = ["git", "add", "--"] + files
+        elif operation == "git_commit":
+            message = metadata.get("message", "Automated commit")
+            cmd = ["git", "commit", "-m", message]
+        elif operation == "git_push":
+            remote = metadata.get("remote", "origin")
+            branch = metadata.get("branch", "main")
+            cmd = ["git", "push", remote, branch]
+        else:
+            raise ValueError(f"Unknown git operation: {operation}")
         
-        try:
-            if operation == "git_init":
-                result = subprocess.run(["git", "init"], capture_output=True, text=True)
-            elif operation == "git_add":
-                files = metadata.get("files", ["."])
-                cmd = ["git", "add"] + files
-                result = subprocess.run(cmd, capture_output=True, text=True)
-            elif operation == "git_commit":
-                message = metadata.get("message", "Automated commit")
-                result = subprocess.run(
-                    ["git", "commit", "-m", message], 
-                    capture_output=True, text=True
-                )
-            elif operation == "git_push":
-                remote = metadata.get("remote", "origin")
-                branch = metadata.get("branch", "main")
-                result = subprocess.run(
-                    ["git", "push", remote, branch], 
-                    capture_output=True, text=True
-                )
-            else:
-                raise ValueError(f"Unknown git operation: {operation}")
-            
-            self.logger.info(f"Git operation {operation} completed")
-            
-            return {
-                "operation": operation,
-                "success": result.returncode == 0,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode
-            }
-            
-        finally:
-            os.chdir(original_cwd) 
\ No newline at end of file
+        # Run git directly in the repository (no shell, no process-wide chdir)
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=repo_path,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        
+        self.logger.info(f"Git operation {operation} completed")
+        
+        return {
+            "operation": operation,
+            "success": proc.returncode == 0,
+            "stdout": stdout.decode('utf-8', 'replace'),
+            "stderr": stderr.decode('utf-8', 'replace'),
+            "return_code": proc.returncode
+        } 
\ No newline at end of file
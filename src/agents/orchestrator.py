@@ -5,13 +5,12 @@ Manages task routing, agent coordination, and system-wide state.
 
 import asyncio
 import json
-import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Type
 from dataclasses import dataclass
 
-from .base_agent import BaseAgent, Task, TaskStatus
+from .base_agent import BaseAgent, Task
 from .file_agent import FileAgent
 from .diagnostic_agent import DiagnosticAgent
 from .web_agent import WebAgent
@@ -38,6 +37,8 @@ class NeoOrchestrator:
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_classes: Dict[str, Type[BaseAgent]] = {}
         self.task_history: List[Task] = []
+        # Shared bus FileWriter handed to every spawned agent (optional)
+        self.file_writer = None
         self.system_state = {
             "started_at": datetime.now(),
             "total_tasks": 0,
@@ -64,6 +65,7 @@ class NeoOrchestrator:
         
         agent_class = self.agent_classes[agent_type]
         agent = agent_class(agent_name, self.workspace_path)
+        agent.file_writer = self.file_writer
         
         self.agents[agent_name] = agent
         
@@ -101,20 +103,7 @@ class NeoOrchestrator:
     def create_task(self, task_type: str, description: str, 
                    metadata: Optional[Dict[str, Any]] = None) -> Task:
         """Create a new task"""
-        task_id = str(uuid.uuid4())
-        now = datetime.now()
-        
-        task = Task(
-            id=task_id,
-            type=task_type,
-            description=description,
-            priority=1,
-            status=TaskStatus.PENDING,
-            created_at=now,
-            updated_at=now,
-            metadata=metadata or {},
-            dependencies=[]
-        )
+        task = Task.new(task_type, description, metadata)
         
         self.task_history.append(task)
         self.system_state["total_tasks"] += 1
@@ -197,14 +186,15 @@ class NeoOrchestrator:
             }
         }
         
-        with open(self.state_file, 'w') as f:
-            json.dump(state_data, f, indent=2)
+        await asyncio.to_thread(
+            self.state_file.write_text, json.dumps(state_data, indent=2), encoding='utf-8'
+        )
     
     async def load_state(self) -> None:
         """Load system state from disk"""
         if self.state_file.exists():
-            with open(self.state_file, 'r') as f:
-                state_data = json.load(f)
+            raw = await asyncio.to_thread(self.state_file.read_text, encoding='utf-8')
+            state_data = json.loads(raw)
                 
             # Restore system state
             if "system_state" in state_data:
@@ -263,15 +253,5 @@ class NeoOrchestrator:
         await self.start_agent("web_agent_01")
         await self.start_agent("ai_agent_01")
         
+        # Agent, log and task directories are created by BaseAgent.__init__
         print(f"Initialized {len(self.agents)} agents")
-        
-        # Create agent directories
-        for agent in self.agents.values():
-            agent_dir = self.workspace_path / "agents" / agent.name
-            agent_dir.mkdir(parents=True, exist_ok=True)
-            
-            log_dir = self.workspace_path / "logs" / agent.name
-            log_dir.mkdir(parents=True, exist_ok=True)
-            
-            task_dir = self.workspace_path / "tasks" / agent.name
-            task_dir.mkdir(parents=True, exist_ok=True) 
\ No newline at end of file
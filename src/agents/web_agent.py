@@ -5,16 +5,19 @@ Optimized for modern web development workflows
 """
 
 import asyncio
-import json
-import subprocess
-import time
+import functools
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-import logging
+from typing import Dict, List, Any, Optional, Tuple
 
 from .base_agent import BaseAgent, Task
 
 
+@functools.lru_cache(maxsize=64)
+def _encode_template(content: str) -> bytes:
+    """UTF-8 encode a generated template once (the templates are constants)"""
+    return content.encode('utf-8')
+
+
 class WebAgent(BaseAgent):
     """
     Agent specialized in web automation and development:
@@ -66,6 +69,14 @@ class WebAgent(BaseAgent):
             self.logger.error(f"Error executing {task_type}: {str(e)}")
             return {"error": str(e), "success": False}
     
+    async def _write_project_files(self, files_to_create: List[Tuple[str, str]]) -> List[str]:
+        """Write (filename, content) pairs into the workspace concurrently"""
+        await self._write_files([
+            (self.workspace_path / filename, _encode_template(content))
+            for filename, content in files_to_create
+        ])
+        return [filename for filename, _ in files_to_create]
+    
     async def _web_development(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Complete web development workflow"""
         description = metadata.get("description", "")
@@ -98,8 +109,6 @@ class WebAgent(BaseAgent):
         readme_content = self._generate_portfolio_readme()
         
         # Create files
-        files_created = []
-        
         files_to_create = [
             ("index.html", html_content),
             ("styles.css", css_content), 
@@ -107,11 +116,7 @@ class WebAgent(BaseAgent):
             ("README.md", readme_content)
         ]
         
-        for filename, content in files_to_create:
-            file_path = self.workspace_path / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            files_created.append(filename)
+        files_created = await self._write_project_files(files_to_create)
         
         return {
             "success": True,
@@ -137,19 +142,13 @@ class WebAgent(BaseAgent):
         css_content = self._generate_todo_css()
         js_content = self._generate_todo_js()
         
-        files_created = []
-        
         files_to_create = [
             ("todo-app.html", html_content),
             ("todo-styles.css", css_content),
             ("todo-script.js", js_content)
         ]
         
-        for filename, content in files_to_create:
-            file_path = self.workspace_path / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            files_created.append(filename)
+        files_created = await self._write_project_files(files_to_create)
         
         return {
             "success": True,
@@ -173,19 +172,13 @@ class WebAgent(BaseAgent):
         css_content = self._generate_landing_css()
         js_content = self._generate_landing_js()
         
-        files_created = []
-        
         files_to_create = [
             ("landing.html", html_content),
             ("landing-styles.css", css_content),
             ("landing-script.js", js_content)
         ]
         
-        for filename, content in files_to_create:
-            file_path = self.workspace_path / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            files_created.append(filename)
+        files_created = await self._write_project_files(files_to_create)
         
         return {
             "success": True,
@@ -214,19 +207,13 @@ class WebAgent(BaseAgent):
         css_content = self._generate_password_generator_css()
         js_content = self._generate_password_generator_js()
         
-        files_created = []
-        
         files_to_create = [
             ("password-generator.html", html_content),
             ("password-generator.css", css_content),
             ("password-generator.js", js_content)
         ]
         
-        for filename, content in files_to_create:
-            file_path = self.workspace_path / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            files_created.append(filename)
+        files_created = await self._write_project_files(files_to_create)
         
         return {
             "success": True,
@@ -251,19 +238,13 @@ class WebAgent(BaseAgent):
         css_content = self._generate_weather_app_css()
         js_content = self._generate_weather_app_js()
         
-        files_created = []
-        
         files_to_create = [
             ("weather-app.html", html_content),
             ("weather-app.css", css_content),
             ("weather-app.js", js_content)
         ]
         
-        for filename, content in files_to_create:
-            file_path = self.workspace_path / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            files_created.append(filename)
+        files_created = await self._write_project_files(files_to_create)
         
         return {
             "success": True,
@@ -288,19 +269,13 @@ class WebAgent(BaseAgent):
         css_content = self._generate_expense_tracker_css()
         js_content = self._generate_expense_tracker_js()
         
-        files_created = []
-        
         files_to_create = [
             ("expense-tracker.html", html_content),
             ("expense-tracker.css", css_content),
             ("expense-tracker.js", js_content)
         ]
         
-        for filename, content in files_to_create:
-            file_path = self.workspace_path / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            files_created.append(filename)
+        files_created = await self._write_project_files(files_to_create)
         
         return {
             "success": True,
@@ -325,19 +300,13 @@ class WebAgent(BaseAgent):
         css_content = self._generate_ultima_dashboard_css()
         js_content = self._generate_ultima_dashboard_js()
         
-        files_created = []
-        
         files_to_create = [
             ("ultima-dashboard.html", html_content),
             ("ultima-dashboard.css", css_content),
             ("ultima-dashboard.js", js_content)
         ]
         
-        for filename, content in files_to_create:
-            file_path = self.workspace_path / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            files_created.append(filename)
+        files_created = await self._write_project_files(files_to_create)
         
         return {
             "success": True,
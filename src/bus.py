@@ -1,25 +1,188 @@
 #!/usr/bin/env python3
 """A very lightweight in-process message bus used by ULTIMA agents.
-Currently just wraps an asyncio.Queue; later can be upgraded to ZeroMQ or Redis.
+Broadcasts every message to all subscribers (one deque per subscriber);
+later can be upgraded to ZeroMQ or Redis.
 All messages are dicts with at least a `type` key.
 """
 
 import asyncio
-from typing import Dict, Any
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+class Subscription:
+    """Async iterator over the messages delivered to one Bus subscriber.
+
+    close() - or leaving `async with` - unsubscribes. The bus only holds
+    subscriptions weakly, so one that is dropped without being closed
+    stops receiving messages too.
+    """
+
+    def __init__(self, dq: deque):
+        self._dq = dq
+        self._ev = asyncio.Event()
+        self._closed = False
+
+    def _deliver(self, messages: Iterable[Dict[str, Any]]):
+        self._dq.extend(messages)
+        self._ev.set()
+
+    def close(self):
+        """Unsubscribe; a pending iteration ends once the queued messages are read"""
+        self._closed = True
+        self._ev.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        while not self._dq:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ev.clear()
+            await self._ev.wait()
+        return self._dq.popleft()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
 
 class Bus:
     def __init__(self):
-        self._queue: asyncio.Queue = asyncio.Queue()
+        self._subs: "weakref.WeakSet[Subscription]" = weakref.WeakSet()
+        # Messages published while nobody was subscribed, handed to the first subscriber
+        self._backlog: deque = deque()
+
+    def _live_subs(self) -> List[Subscription]:
+        subs = [sub for sub in self._subs if not sub._closed]
+        if len(subs) != len(self._subs):
+            self._subs = weakref.WeakSet(subs)
+        return subs
 
     async def publish(self, message: Dict[str, Any]):
-        """Put a message onto the bus."""
-        await self._queue.put(message)
+        """Deliver a message to every current subscriber."""
+        await self.publish_many((message,))
+
+    async def publish_many(self, messages: Iterable[Dict[str, Any]]):
+        """Deliver a burst of messages with a single wake-up per subscriber."""
+        messages = list(messages)
+        subs = self._live_subs()
+        if not subs:
+            self._backlog.extend(messages)
+        for sub in subs:
+            sub._deliver(messages)
 
-    async def subscribe(self):
-        """Async generator that yields messages as they arrive."""
+    def subscribe(self) -> Subscription:
+        """Return a Subscription to every message published from now on.
+
+        The subscriber is registered immediately, so nothing published between
+        this call and the first iteration is missed. The first subscriber also
+        receives anything published before anyone subscribed.
+        """
+        dq: deque = self._backlog if not self._live_subs() else deque()
+        self._backlog = deque()
+        sub = Subscription(dq)
+        self._subs.add(sub)
+        return sub
+
+
+class FileWriter:
+    """Single writer task serving `write_file` messages from the bus.
+
+    Requests are batched (up to MAX_BATCH, or whatever arrives within
+    FLUSH_TIMEOUT of the first one) and written together in worker threads.
+    Each message carries a `future` resolved once its bytes are on disk.
+    While the writer is not running, write_many writes directly instead.
+    """
+
+    MAX_BATCH = 16
+    FLUSH_TIMEOUT = 0.005
+
+    def __init__(self, bus: Bus):
+        self.bus = bus
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        # Futures handed out by write_many and not yet resolved
+        self._waiting: Set[asyncio.Future] = set()
+
+    def start(self):
+        """Subscribe to the bus and start the writer loop"""
+        messages = self.bus.subscribe()
+        self._tasks = [
+            asyncio.create_task(self._collect(messages)),
+            asyncio.create_task(self._flush_loop()),
+        ]
+
+    async def stop(self):
+        """Stop the writer loop; writes still waiting fail instead of hanging"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for future in self._waiting:
+            if not future.done():
+                future.set_exception(RuntimeError("FileWriter stopped before the write completed"))
+        self._waiting.clear()
+        self._pending = asyncio.Queue()
+
+    async def write_many(self, files: Iterable[Tuple[Path, bytes]]) -> None:
+        """Publish one write request per file and wait until all are written"""
+        if not self._tasks:
+            # Not started (or already stopped): nobody would resolve the futures
+            await asyncio.gather(*(asyncio.to_thread(Path(path).write_bytes, data) for path, data in files))
+            return
+        
+        loop = asyncio.get_running_loop()
+        messages = [
+            {"type": "write_file", "path": str(path), "bytes": data, "future": loop.create_future()}
+            for path, data in files
+        ]
+        futures = [msg["future"] for msg in messages]
+        self._waiting.update(futures)
+        try:
+            await self.bus.publish_many(messages)
+            await asyncio.gather(*futures)
+        finally:
+            self._waiting.difference_update(futures)
+
+    async def _collect(self, messages: Subscription):
+        async with messages:
+            async for msg in messages:
+                if msg.get("type") == "write_file":
+                    self._pending.put_nowait(msg)
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
         while True:
-            msg = await self._queue.get()
-            yield msg
+            batch = [await self._pending.get()]
+            deadline = loop.time() + self.FLUSH_TIMEOUT
+            while len(batch) < self.MAX_BATCH:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        results = await asyncio.gather(
+            *(asyncio.to_thread(Path(msg["path"]).write_bytes, msg["bytes"]) for msg in batch),
+            return_exceptions=True,
+        )
+        for msg, result in zip(batch, results):
+            future: Optional[asyncio.Future] = msg.get("future")
+            if future is None or future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(None)
 
 # Global bus instance
-bus = Bus() 
\ No newline at end of file
+bus = Bus()
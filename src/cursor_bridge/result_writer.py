@@ -3,12 +3,60 @@ Cursor Result Writer - Writes task results back to Cursor workspace
 Creates result files and updates source files with completion status
 """
 
+import asyncio
 import json
+import os
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 import logging
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+
+_SUMMARY_TEMPLATE = """# ULTIMA Task Result Summary
+
+**Task ID**: {task_id}
+**Completed**: {completed}
+
+## Summary
+{summary}
+
+## Files Created
+{files}{live_url}
+## How to Use
+1. Check the created files in your workspace
+2. Review the implementation
+3. Test the functionality
+4. Deploy or integrate as needed
+
+---
+*Generated by ULTIMA - Single Prompt → Complete MVP*
+"""
+
+
+def atomic_write(path: Path, data: Union[str, bytes]) -> None:
+    """Write data to path through a temp file and os.replace.
+    
+    Readers (e.g. watchers on task_results/) see either the old file or the
+    complete new one, never a partial write. No fsync: callers that need
+    durability sync once after a batch of writes.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
 
 class CursorResultWriter:
     """
@@ -40,8 +88,10 @@ class CursorResultWriter:
                 "message": result_data.get("message", "Task completed successfully")
             }
             
-            with open(result_file, 'w') as f:
-                json.dump(result_payload, f, indent=2)
+            if orjson is not None:
+                atomic_write(result_file, orjson.dumps(result_payload, option=orjson.OPT_INDENT_2))
+            else:
+                atomic_write(result_file, json.dumps(result_payload, indent=2))
             
             self.logger.info(f"Created result file: {result_file}")
             
@@ -54,6 +104,10 @@ class CursorResultWriter:
             self.logger.error(f"Error writing task result {task_id}: {e}")
             return False
     
+    async def awrite_task_result(self, task_id: str, result_data: Dict[str, Any]) -> bool:
+        """write_task_result() run in a worker thread so the event loop keeps going"""
+        return await asyncio.to_thread(self.write_task_result, task_id, result_data)
+    
     def _update_source_comment(self, task_id: str, result_payload: Dict[str, Any]):
         """Update the original source file comment with completion status"""
         try:
@@ -63,8 +117,8 @@ class CursorResultWriter:
                 self.logger.warning(f"Could not find original task file for {task_id}")
                 return
             
-            with open(task_files[0], 'r') as f:
-                task_data = json.load(f)
+            raw = task_files[0].read_bytes()
+            task_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             source_file = Path(task_data["metadata"]["source_file"])
             source_line = task_data["metadata"]["source_line"]
@@ -99,40 +153,24 @@ class CursorResultWriter:
         try:
             summary_file = self.results_dir / f"summary_{task_id}.md"
             
-            content = f"""# ULTIMA Task Result Summary
-
-**Task ID**: {task_id}
-**Completed**: {time.strftime('%Y-%m-%d %H:%M:%S')}
-
-## Summary
-{summary}
-
-## Files Created
-"""
-            
-            for file_path in files_created:
-                content += f"- `{file_path}`\n"
-            
-            if live_url:
-                content += f"\n## Live URL\n{live_url}\n"
+            content = _SUMMARY_TEMPLATE.format(
+                task_id=task_id,
+                completed=time.strftime('%Y-%m-%d %H:%M:%S'),
+                summary=summary,
+                files="".join(f"- `{file_path}`\n" for file_path in files_created),
+                live_url=f"\n## Live URL\n{live_url}\n" if live_url else "",
+            )
             
-            content += f"""
-## How to Use
-1. Check the created files in your workspace
-2. Review the implementation
-3. Test the functionality
-4. Deploy or integrate as needed
-
----
-*Generated by ULTIMA - Single Prompt → Complete MVP*
-"""
-            
-            with open(summary_file, 'w') as f:
-                f.write(content)
+            atomic_write(summary_file, content)
             
             self.logger.info(f"Created result summary: {summary_file}")
             return True
             
         except Exception as e:
             self.logger.error(f"Error creating result summary for {task_id}: {e}")
-            return False 
\ No newline at end of file
+            return False 
+    
+    async def acreate_result_summary(self, task_id: str, files_created: List[str],
+                                     summary: str, live_url: Optional[str] = None) -> bool:
+        """create_result_summary() run in a worker thread so the event loop keeps going"""
+        return await asyncio.to_thread(self.create_result_summary, task_id, files_created, summary, live_url)
@@ -3,19 +3,53 @@ Cursor Task Detector - Monitors workspace for AI task definitions
 Parses special comments like: // #AI_TASK: Create a simple website
 """
 
+import os
 import re
+import functools
 import time
 import json
+import hashlib
+import mmap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Tuple
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import logging
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+
+# Compiled once at import; _parse_task runs for every candidate comment line
+_TASK_RE = re.compile(r'#AI_TASK:\s*([^[\n\r]+)')
+_PARAM_RE = re.compile(r'\[(\w+):([^\]]+)\]')
+_PARAM_STRIP_RE = re.compile(r'\s*\[[\w:]+\]')
+# Whole lines containing a task marker, matched over the full file buffer
+_LINE_RE = re.compile(r'^.*#AI_TASK:.*$', re.MULTILINE)
+# Task type keywords, checked in order. Plain substrings (no word boundaries),
+# so e.g. "application" still hits "app" and lands in mobile_development.
+_TASK_TYPE_RES = (
+    (re.compile(r'website|webpage|landing|portfolio|html|css', re.IGNORECASE), 'web_development'),
+    (re.compile(r'android|app|mobile|game|apk', re.IGNORECASE), 'mobile_development'),
+    (re.compile(r'api|rest|endpoint|server|backend', re.IGNORECASE), 'api_development'),
+    (re.compile(r'desktop|gui|application|tool', re.IGNORECASE), 'desktop_development'),
+    (re.compile(r'file|folder|organize|backup', re.IGNORECASE), 'file_operations'),
+)
+# Directories never worth descending into during the initial scan
+_SKIP_DIRS = frozenset({'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build', 'detected_tasks'})
+
 
 class TaskDefinition:
     """Represents a parsed task from Cursor comments"""
     
+    # Whole task-comment lines; run finditer over a buffer and feed _from_match
+    PATTERN = _LINE_RE
+    
     def __init__(self, raw_text: str, file_path: Path, line_number: int):
         self.raw_text = raw_text
         self.file_path = file_path
@@ -23,41 +57,23 @@ class TaskDefinition:
         self.task_id = self._generate_task_id()
         self.parsed_data = self._parse_task()
     
+    @classmethod
+    def _from_match(cls, match: "re.Match[str]", file_path: Path, line_number: int) -> "TaskDefinition":
+        """Build a task from a PATTERN match"""
+        return cls(match.group().strip(), file_path, line_number)
+    
     def _generate_task_id(self) -> str:
-        """Generate unique task ID"""
-        import hashlib
+        """Generate unique task ID (a local dedup key, so no cryptographic hash)"""
         content = f"{self.file_path}:{self.line_number}:{self.raw_text}"
-        return hashlib.md5(content.encode()).hexdigest()[:12]
+        return hashlib.blake2b(content.encode(), digest_size=6).hexdigest()
     
     def _parse_task(self) -> Dict[str, Any]:
         """Parse task comment into structured data"""
-        # Match patterns like:
-        # // #AI_TASK: Create a simple website
-        # # #AI_TASK: Build Android game [priority:high] [type:mobile]
-        
-        # Improved regex to handle different comment styles
-        task_match = re.search(r'#AI_TASK:\s*([^[\n\r]+)', self.raw_text)
-        if not task_match:
+        parsed = _parse_task_text(self.raw_text)
+        if parsed is None:
             return {}
         
-        description = task_match.group(1).strip()
-        
-        # Skip empty descriptions or invalid patterns
-        if not description or len(description) < 5:
-            return {}
-        
-        # Extract optional parameters in brackets
-        params = {}
-        param_matches = re.findall(r'\[(\w+):([^\]]+)\]', self.raw_text)
-        for key, value in param_matches:
-            params[key] = value.strip()
-        
-        # Clean description from parameters
-        description = re.sub(r'\s*\[[\w:]+\]', '', description).strip()
-        
-        # Infer task type from description
-        task_type = self._infer_task_type(description, params.get('type'))
-        
+        description, task_type, params = parsed
         return {
             "description": description,
             "type": task_type,
@@ -69,36 +85,56 @@ class TaskDefinition:
                 **params
             }
         }
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_task_text(raw_text: str) -> Optional[Tuple[str, str, Dict[str, str]]]:
+    """Parse a task comment into (description, type, params); None if it isn't a task.
     
-    def _infer_task_type(self, description: str, explicit_type: Optional[str]) -> str:
-        """Infer task type from description"""
-        if explicit_type:
-            return explicit_type
-        
-        description_lower = description.lower()
-        
-        # Web development patterns
-        if any(word in description_lower for word in ['website', 'webpage', 'landing', 'portfolio', 'html', 'css']):
-            return 'web_development'
-        
-        # Mobile development patterns
-        if any(word in description_lower for word in ['android', 'app', 'mobile', 'game', 'apk']):
-            return 'mobile_development'
-        
-        # API development patterns
-        if any(word in description_lower for word in ['api', 'rest', 'endpoint', 'server', 'backend']):
-            return 'api_development'
-        
-        # Desktop application patterns
-        if any(word in description_lower for word in ['desktop', 'gui', 'application', 'tool']):
-            return 'desktop_development'
-        
-        # File operations
-        if any(word in description_lower for word in ['file', 'folder', 'organize', 'backup']):
-            return 'file_operations'
-        
-        # Default to general development
-        return 'general_development'
+    Depends only on the comment text, so repeated comments and rescans of
+    unchanged lines are served from the cache. Callers must not mutate params.
+    """
+    # Match patterns like:
+    # // #AI_TASK: Create a simple website
+    # # #AI_TASK: Build Android game [priority:high] [type:mobile]
+    
+    # Improved regex to handle different comment styles
+    task_match = _TASK_RE.search(raw_text)
+    if not task_match:
+        return None
+    
+    description = task_match.group(1).strip()
+    
+    # Skip empty descriptions or invalid patterns
+    if not description or len(description) < 5:
+        return None
+    
+    # Extract optional parameters in brackets
+    params = {}
+    param_matches = _PARAM_RE.findall(raw_text)
+    for key, value in param_matches:
+        params[key] = value.strip()
+    
+    # Clean description from parameters
+    description = _PARAM_STRIP_RE.sub('', description).strip()
+    
+    # Infer task type from description
+    task_type = _infer_task_type(description, params.get('type'))
+    
+    return description, task_type, params
+
+
+def _infer_task_type(description: str, explicit_type: Optional[str]) -> str:
+    """Infer task type from description"""
+    if explicit_type:
+        return explicit_type
+    
+    for pattern, task_type in _TASK_TYPE_RES:
+        if pattern.search(description):
+            return task_type
+    
+    # Default to general development
+    return 'general_development'
 
 
 class CursorTaskDetector(FileSystemEventHandler):
@@ -107,6 +143,16 @@ class CursorTaskDetector(FileSystemEventHandler):
     Watches for file changes and scans for #AI_TASK comments.
     """
     
+    # Quiet period that coalesces an editor's burst of events into one scan
+    DEBOUNCE_SECONDS = 0.25
+    DEBOUNCE_POLL_SECONDS = 0.1
+    # Dedup window for task IDs; older IDs are forgotten first
+    MAX_PROCESSED_IDS = 50_000
+    # Files at least this big are scanned through mmap instead of read()
+    MMAP_THRESHOLD = 1 << 20
+    # Task lines as bytes, compiled once and run straight over mmapped files
+    _AI_TASK_RE = re.compile(rb'^[^\r\n]*#AI_TASK:[^\r\n]*', re.MULTILINE)
+    
     def __init__(self, workspace_path: Path, output_dir: Path):
         self.workspace_path = workspace_path
         self.output_dir = output_dir
@@ -115,62 +161,221 @@ class CursorTaskDetector(FileSystemEventHandler):
         # File patterns to monitor
         self.monitored_extensions = {'.py', '.js', '.ts', '.md', '.txt', '.java', '.kt', '.go', '.rs'}
         
-        # Processed tasks to avoid duplicates
-        self.processed_tasks: Set[str] = set()
-        
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Processed tasks to avoid duplicates, persisted across restarts.
+        # Insertion-ordered so only the newest MAX_PROCESSED_IDS are kept.
+        self.processed_ids_file = self.output_dir / ".processed_ids.txt"
+        self.processed_tasks: "OrderedDict[str, None]" = self._load_processed_ids()
+        self._processed_log = None  # append handle, opened on first write
+        # Guards processed_tasks and _processed_log; files are scanned from several threads
+        self._processed_lock = threading.Lock()
+        
+        # (mtime_ns, size, md5) per scanned file, persisted across restarts.
+        # JSON content, but not a *.json name: readers of output_dir treat those as tasks.
+        self.scan_cache_file = self.output_dir / ".scan_cache"
+        self._file_hashes: Dict[str, Tuple[int, int, str]] = self._load_scan_cache()
+        
+        # Debounced watchdog events: path -> monotonic deadline
+        self._pending: Dict[Path, float] = {}
+        self._pending_lock = threading.Lock()
+        
+        # Set by stop_monitoring() to end start_monitoring()
+        self._stop = threading.Event()
+        
         # Initial scan of existing files
         self._scan_existing_files()
+        self._save_scan_cache()
+    
+    def _load_processed_ids(self) -> "OrderedDict[str, None]":
+        """Load the most recent task IDs emitted by previous runs"""
+        processed: "OrderedDict[str, None]" = OrderedDict()
+        try:
+            with open(self.processed_ids_file, 'r') as f:
+                ids = [line.strip() for line in f if line.strip()]
+        except OSError:
+            return processed
+        
+        for task_id in ids[-self.MAX_PROCESSED_IDS:]:
+            processed[task_id] = None
+        
+        # Compact the log once it has outgrown the in-memory window
+        if len(ids) > self.MAX_PROCESSED_IDS:
+            with open(self.processed_ids_file, 'w') as f:
+                f.write("".join(f"{task_id}\n" for task_id in processed))
+        return processed
+    
+    def _remember_task(self, task_id: str) -> bool:
+        """Record a task ID; False if it was already seen. Caller holds _processed_lock."""
+        if task_id in self.processed_tasks:
+            return False
+        self.processed_tasks[task_id] = None
+        if len(self.processed_tasks) > self.MAX_PROCESSED_IDS:
+            self.processed_tasks.popitem(last=False)
+        return True
+    
+    def _append_processed_ids(self, task_ids: List[str]):
+        """Append task IDs to the processed-ID log. Caller holds _processed_lock."""
+        if self._processed_log is None:
+            self._processed_log = open(self.processed_ids_file, 'a', buffering=1 << 15)
+        self._processed_log.write("".join(f"{task_id}\n" for task_id in task_ids))
+        self._processed_log.flush()
+    
+    def _close_processed_log(self):
+        """Flush, fsync and close the processed-ID log; the next write reopens it"""
+        with self._processed_lock:
+            if self._processed_log is None:
+                return
+            self._processed_log.flush()
+            os.fsync(self._processed_log.fileno())
+            self._processed_log.close()
+            self._processed_log = None
+    
+    def _load_scan_cache(self) -> Dict[str, Tuple[int, int, str]]:
+        """Load the file hash cache written by a previous run"""
+        try:
+            with open(self.scan_cache_file, 'r') as f:
+                return {path: tuple(entry) for path, entry in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_scan_cache(self):
+        """Persist the file hash cache so restarts skip unchanged files"""
+        try:
+            with open(self.scan_cache_file, 'w') as f:
+                json.dump(self._file_hashes, f)
+        except OSError as e:
+            self.logger.warning(f"Could not save scan cache: {e}")
     
     def _scan_existing_files(self):
         """Scan existing files for task definitions on startup"""
         self.logger.info("Scanning existing files for AI tasks...")
         
-        for file_path in self.workspace_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix in self.monitored_extensions:
-                self._scan_file(file_path)
+        # Per-file work is mostly read() and hashing, which release the GIL
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            for _ in pool.map(self._scan_file, self._iter_source_files(str(self.workspace_path))):
+                pass
+    
+    def _iter_source_files(self, root: str):
+        """Yield monitored files under root, pruning _SKIP_DIRS"""
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS:
+                    yield from self._iter_source_files(entry.path)
+            elif entry.is_file(follow_symlinks=False) and os.path.splitext(entry.name)[1] in self.monitored_extensions:
+                yield Path(entry.path)
     
     def _scan_file(self, file_path: Path) -> List[TaskDefinition]:
         """Scan a single file for task definitions"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
+            # Editors fire several events per save; skip files we've already seen
+            stat = file_path.stat()
+            cached = self._file_hashes.get(str(file_path))
+            if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return []
+            
+            if stat.st_size >= self.MMAP_THRESHOLD:
+                task_lines = self._read_task_lines_mapped(file_path, stat, cached)
+            else:
+                task_lines = self._read_task_lines(file_path, stat, cached)
             
             found_tasks = []
-            for line_num, line in enumerate(lines, 1):
-                if '#AI_TASK:' in line:
-                    task_def = TaskDefinition(line.strip(), file_path, line_num)
-                    
-                    # Skip if already processed
-                    if task_def.task_id not in self.processed_tasks:
-                        found_tasks.append(task_def)
-                        self._write_task_file(task_def)
-                        self.processed_tasks.add(task_def.task_id)
-                        
-                        self.logger.info(f"Found new AI task: {task_def.parsed_data['description']}")
+            for line_num, raw_text in task_lines:
+                task_def = TaskDefinition(raw_text, file_path, line_num)
+                
+                # Skip if already processed
+                with self._processed_lock:
+                    if not self._remember_task(task_def.task_id):
+                        continue
+                found_tasks.append(task_def)
+                
+                self.logger.info(f"Found new AI task: {task_def.parsed_data.get('description')}")
             
+            # Serialize everything first, then write each file in one call
+            self._write_task_files(found_tasks)
             return found_tasks
             
         except Exception as e:
             self.logger.error(f"Error scanning file {file_path}: {e}")
             return []
     
-    def _write_task_file(self, task_def: TaskDefinition):
-        """Write task definition to output directory"""
+    def _read_task_lines(self, file_path: Path, stat: os.stat_result, cached) -> List[Tuple[int, str]]:
+        """Read a file and return (line_number, text) for each task line; [] if unchanged"""
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        digest = hashlib.md5(data).hexdigest()
+        self._file_hashes[str(file_path)] = (stat.st_mtime_ns, stat.st_size, digest)
+        if cached and cached[2] == digest:
+            return []
+        
+        # Most files have no tasks: bail out before decoding anything
+        if data.find(b'#AI_TASK:') == -1:
+            return []
+        
+        text = data.decode('utf-8', errors='ignore')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        task_lines = []
+        line_num, last_pos = 1, 0
+        for match in TaskDefinition.PATTERN.finditer(text):
+            line_num += text.count('\n', last_pos, match.start())
+            last_pos = match.start()
+            task_lines.append((line_num, match.group().strip()))
+        return task_lines
+    
+    def _read_task_lines_mapped(self, file_path: Path, stat: os.stat_result, cached) -> List[Tuple[int, str]]:
+        """Like _read_task_lines, but over an mmap so big files are never copied whole"""
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            digest = hashlib.md5(mm).hexdigest()
+            self._file_hashes[str(file_path)] = (stat.st_mtime_ns, stat.st_size, digest)
+            if cached and cached[2] == digest:
+                return []
+            
+            if mm.find(b'#AI_TASK:') == -1:
+                return []
+            
+            task_lines = []
+            line_num, last_pos = 1, 0
+            for match in self._AI_TASK_RE.finditer(mm):
+                line_num += mm[last_pos:match.start()].count(b'\n')
+                last_pos = match.start()
+                task_lines.append((line_num, match.group().decode('utf-8', errors='ignore').strip()))
+            return task_lines
+    
+    def _task_payload(self, task_def: TaskDefinition) -> bytes:
+        """Serialize a task definition to its JSON file contents"""
         task_data = {
             "id": task_def.task_id,
             "status": "pending",
             "created_at": time.time(),
             **task_def.parsed_data
         }
+        if orjson is not None:
+            return orjson.dumps(task_data, option=orjson.OPT_INDENT_2)
+        return json.dumps(task_data, indent=2).encode('utf-8')
+    
+    def _write_task_files(self, task_defs: List[TaskDefinition]):
+        """Write task definitions to the output directory"""
+        payloads = [(task_def, self._task_payload(task_def)) for task_def in task_defs]
         
-        output_file = self.output_dir / f"task_{task_def.task_id}.json"
-        with open(output_file, 'w') as f:
-            json.dump(task_data, f, indent=2)
+        for task_def, payload in payloads:
+            output_file = self.output_dir / f"task_{task_def.task_id}.json"
+            with open(output_file, 'wb', buffering=1 << 16) as f:
+                f.write(payload)
+            
+            self.logger.info(f"Created task file: {output_file}")
         
-        self.logger.info(f"Created task file: {output_file}")
+        if task_defs:
+            with self._processed_lock:
+                self._append_processed_ids([task_def.task_id for task_def in task_defs])
     
     def on_modified(self, event):
         """Handle file modification events"""
@@ -178,8 +383,8 @@ class CursorTaskDetector(FileSystemEventHandler):
             return
         
         file_path = Path(event.src_path)
-        if file_path.suffix in self.monitored_extensions:
-            self._scan_file(file_path)
+        if self._should_watch(file_path):
+            self._schedule_scan(file_path)
     
     def on_created(self, event):
         """Handle file creation events"""
@@ -187,24 +392,81 @@ class CursorTaskDetector(FileSystemEventHandler):
             return
         
         file_path = Path(event.src_path)
-        if file_path.suffix in self.monitored_extensions:
-            self._scan_file(file_path)
+        if self._should_watch(file_path):
+            self._schedule_scan(file_path)
     
-    def start_monitoring(self):
-        """Start monitoring the workspace"""
+    def _should_watch(self, file_path: Path) -> bool:
+        """Monitored extension, outside output_dir and the _SKIP_DIRS the startup scan prunes"""
+        if file_path.suffix not in self.monitored_extensions:
+            return False
+        # output_dir holds our own state (e.g. .processed_ids.txt); scanning it would loop
+        if file_path.is_relative_to(self.output_dir):
+            return False
+        try:
+            parts = file_path.relative_to(self.workspace_path).parts[:-1]
+        except ValueError:
+            parts = file_path.parts[:-1]
+        return _SKIP_DIRS.isdisjoint(parts)
+    
+    def _schedule_scan(self, file_path: Path):
+        """Queue a scan; further events for the same file push the deadline back"""
+        with self._pending_lock:
+            self._pending[file_path] = time.monotonic() + self.DEBOUNCE_SECONDS
+    
+    def _scan_due_files(self):
+        """Scan every queued file whose quiet period has elapsed"""
+        now = time.monotonic()
+        with self._pending_lock:
+            due = [path for path, deadline in self._pending.items() if deadline <= now]
+            for path in due:
+                del self._pending[path]
+        
+        for path in due:
+            self._scan_file(path)
+    
+    def _debounce_worker(self, stop_event: threading.Event):
+        """Background loop that drains the debounce queue"""
+        while not stop_event.wait(self.DEBOUNCE_POLL_SECONDS):
+            self._scan_due_files()
+    
+    def start_observer(self) -> Observer:
+        """Start watching the workspace without blocking; undo with stop_observer()"""
         observer = Observer()
         observer.schedule(self, str(self.workspace_path), recursive=True)
         observer.start()
         
+        self._stop_debounce = threading.Event()
+        self._debounce_thread = threading.Thread(
+            target=self._debounce_worker, args=(self._stop_debounce,), daemon=True
+        )
+        self._debounce_thread.start()
+        
         self.logger.info(f"Started monitoring {self.workspace_path} for AI tasks")
+        return observer
+    
+    def stop_observer(self, observer: Observer):
+        """Stop watching and persist the scan cache and processed IDs"""
+        observer.stop()
+        observer.join()
+        self._stop_debounce.set()
+        self._debounce_thread.join()
+        self._save_scan_cache()
+        self._close_processed_log()
+    
+    def start_monitoring(self):
+        """Start monitoring the workspace; blocks until stop_monitoring() or Ctrl+C"""
+        observer = self.start_observer()
         
         try:
-            while True:
-                time.sleep(1)
+            self._stop.wait()
         except KeyboardInterrupt:
-            observer.stop()
+            pass
         
-        observer.join()
+        self.stop_observer(observer)
+    
+    def stop_monitoring(self):
+        """Make start_monitoring() shut down and return"""
+        self._stop.set()
 
 
 def main():
@@ -1,23 +1,95 @@
 #!/usr/bin/env python3
 """Simple async wrapper for chatting with local Ollama server."""
-import asyncio, json, requests
-from typing import Optional
+import asyncio
+import json
+import httpx
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Optional, Tuple
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
+OLLAMA_BASE_URL = "http://localhost:11434"
 DEFAULT_MODEL = "mistral:instruct"
+CHAT_CACHE_SIZE = 256
 
-def _sync_generate(data):
-    r = requests.post(OLLAMA_URL, json=data, timeout=180)
-    r.raise_for_status()
-    return r.json()["response"]
+# Shared keep-alive client: concurrent agents reuse pooled TCP connections.
+# Its pool belongs to the loop that created it, so each loop gets its own.
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
 
-async def chat(prompt: str, model: str = DEFAULT_MODEL, system: Optional[str] = None) -> str:
+# (model, system, prompt) -> reply, least recently used first
+_chat_cache: "OrderedDict[Tuple[str, Optional[str], str], str]" = OrderedDict()
+# Generations in flight, so identical concurrent calls share one request
+_chat_inflight: Dict[Tuple[str, Optional[str], str], asyncio.Task] = {}
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=OLLAMA_BASE_URL,
+            timeout=180,
+            limits=httpx.Limits(max_keepalive_connections=16),
+        )
+        _client_loop = loop
+    return _client
+
+async def aclose():
+    """Close the shared client; the next request opens a new one."""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+async def chat_stream(prompt: str, model: str = DEFAULT_MODEL, system: Optional[str] = None) -> AsyncIterator[str]:
+    """Yield response fragments as Ollama generates them."""
     data = {
         "model": model,
         "prompt": prompt,
-        "stream": False,
+        "stream": True,
     }
     if system:
         data["system"] = system
-    # run blocking HTTP in thread pool
-    return await asyncio.to_thread(_sync_generate, data) 
\ No newline at end of file
+    async with _get_client().stream("POST", "/api/generate", json=data) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise RuntimeError(f"Ollama error: {chunk['error']}")
+            if chunk.get("response"):
+                yield chunk["response"]
+            if chunk.get("done"):
+                break
+
+async def _generate(prompt: str, model: str, system: Optional[str]) -> str:
+    return "".join([part async for part in chat_stream(prompt, model, system)])
+
+def _remember(key: Tuple[str, Optional[str], str], task: asyncio.Task):
+    _chat_inflight.pop(key, None)
+    # Failed or empty generations are retried on the next call
+    if task.cancelled() or task.exception() is not None or not task.result():
+        return
+    _chat_cache[key] = task.result()
+    if len(_chat_cache) > CHAT_CACHE_SIZE:
+        _chat_cache.popitem(last=False)
+
+async def chat(prompt: str, model: str = DEFAULT_MODEL, system: Optional[str] = None,
+               no_cache: bool = False) -> str:
+    """Return the full reply; identical (model, system, prompt) calls are answered from cache
+    unless no_cache is set."""
+    if no_cache:
+        return await _generate(prompt, model, system)
+
+    key = (model, system, prompt)
+    if key in _chat_cache:
+        _chat_cache.move_to_end(key)
+        return _chat_cache[key]
+
+    task = _chat_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_generate(prompt, model, system))
+        _chat_inflight[key] = task
+        task.add_done_callback(lambda t: _remember(key, t))
+    # One caller being cancelled must not cancel the request for the others
+    return await asyncio.shield(task)
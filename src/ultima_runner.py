@@ -5,12 +5,20 @@ Demonstrates the orchestrator and agent system.
 """
 
 import asyncio
+import os
 import signal
 import sys
 from pathlib import Path
-import threading
 import json
 
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -21,21 +29,68 @@ from agents.desktop_agent import DesktopAgent
 from agents.planner_agent import PlannerAgent
 from agents.coder_agent import CoderAgent
 from agents.tester_agent import TesterAgent
+from bus import bus, FileWriter
+import llm
+
+
+class DetectedTaskHandler(FileSystemEventHandler):
+    """Forwards new task_*.json files from the watchdog thread to an asyncio queue"""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        self.loop = loop
+        self.queue = queue
+    
+    def _enqueue(self, path: str):
+        file_path = Path(path)
+        if file_path.name.startswith("task_") and file_path.suffix == ".json":
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, file_path)
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self._enqueue(event.src_path)
+    
+    def on_modified(self, event):
+        # A created file may still be empty; its write shows up as a modification
+        if not event.is_directory:
+            self._enqueue(event.src_path)
 
 
 class UltimaRunner:
     """Main runner for ULTIMA framework"""
     
+    # (agent type, agent name) spawned at startup
+    AGENTS = (
+        ("file", "file_agent_01"),
+        ("desktop", "desktop_agent_01"),
+        ("planning", "planner_agent_01"),
+        ("coder", "coder_agent_01"),
+        ("tester", "tester_agent_01"),
+    )
+    
     def __init__(self):
         self.workspace_path = Path(__file__).parent.parent
+        # Read by web_dashboard.get_ultima_status(); present only while the runner is up
+        self.pid_file = self.workspace_path / "run" / "ultima.pid"
         self.orchestrator = NeoOrchestrator(self.workspace_path)
+        self.file_writer = FileWriter(bus)
         self.running = True
+        self._stop = asyncio.Event()
+        self._loop = None
+        self.detector = None
+        self.detector_observer = None
     
     async def setup(self):
         """Setup the ULTIMA system"""
         print("🚀 Starting ULTIMA Framework...")
         print(f"📁 Workspace: {self.workspace_path}")
         
+        self.pid_file.parent.mkdir(exist_ok=True)
+        self.pid_file.write_text(str(os.getpid()))
+        
+        # Single writer task for agent file output, started before any agent spawns
+        self.file_writer.start()
+        self.orchestrator.file_writer = self.file_writer
+        
         # Register agent classes
         self.orchestrator.register_agent_class("file", FileAgent)
         self.orchestrator.register_agent_class("desktop", DesktopAgent)
@@ -43,19 +98,9 @@ class UltimaRunner:
         self.orchestrator.register_agent_class("coder", CoderAgent)
         self.orchestrator.register_agent_class("tester", TesterAgent)
         
-        # Spawn initial agents
-        file_agent = await self.orchestrator.spawn_agent("file", "file_agent_01")
-        desktop_agent = await self.orchestrator.spawn_agent("desktop", "desktop_agent_01")
-        planner_agent = await self.orchestrator.spawn_agent("planning", "planner_agent_01")
-        coder_agent = await self.orchestrator.spawn_agent("coder", "coder_agent_01")
-        tester_agent = await self.orchestrator.spawn_agent("tester", "tester_agent_01")
-        
-        # Start agents
-        await self.orchestrator.start_agent("file_agent_01")
-        await self.orchestrator.start_agent("desktop_agent_01")
-        await self.orchestrator.start_agent("planner_agent_01")
-        await self.orchestrator.start_agent("coder_agent_01")
-        await self.orchestrator.start_agent("tester_agent_01")
+        # Spawn and start initial agents; each batch runs concurrently
+        await asyncio.gather(*(self.orchestrator.spawn_agent(kind, name) for kind, name in self.AGENTS))
+        await asyncio.gather(*(self.orchestrator.start_agent(name) for _, name in self.AGENTS))
         
         print("✅ ULTIMA Framework initialized")
         print("📋 Available capabilities:", list(self.orchestrator.capabilities.keys()))
@@ -65,17 +110,15 @@ class UltimaRunner:
         print("👀 Starting Task Detector...")
         
         # The detector writes to detected_tasks, which the orchestrator will read from.
-        detector = CursorTaskDetector(
+        self.detector = CursorTaskDetector(
             workspace_path=self.workspace_path,
             output_dir=self.workspace_path / "detected_tasks"
         )
         
-        # start_monitoring is a blocking call, so run it in a separate thread.
-        detector_thread = threading.Thread(target=detector.start_monitoring, daemon=True)
-        detector_thread.start()
+        # Watchdog's observer thread drives the detector; nothing here blocks.
+        self.detector_observer = self.detector.start_observer()
         
         print("✅ Task Detector is running in the background.")
-        return detector_thread
 
     async def demo_tasks(self):
         """Run demonstration tasks"""
@@ -148,29 +191,55 @@ class UltimaRunner:
         print("\n🛑 Shutting down ULTIMA...")
         self.running = False
         
+        if self.detector_observer is not None:
+            await asyncio.to_thread(self.detector.stop_observer, self.detector_observer)
+            self.detector_observer = None
+        
         await self.orchestrator.save_state()
         await self.orchestrator.stop_all_agents()
+        await self.file_writer.stop()
+        await llm.aclose()
+        self.pid_file.unlink(missing_ok=True)
         
         print("✅ ULTIMA shutdown complete")
     
     def handle_signal(self, signum, frame):
         """Handle shutdown signals"""
         print(f"\n📨 Received signal {signum}")
-        asyncio.create_task(self.shutdown())
+        # Wake run(), which shuts down on its way out
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
     
     async def ingest_detected_tasks(self):
-        """Periodically scans detected_tasks directory and ingests new tasks."""
+        """Ingests task files from detected_tasks as watchdog reports them."""
         processed_files = set()
         tasks_dir = self.workspace_path / "detected_tasks"
         tasks_dir.mkdir(exist_ok=True)
         
-        while self.running:
-            for file_path in tasks_dir.glob("task_*.json"):
+        queue: asyncio.Queue = asyncio.Queue()
+        observer = Observer()
+        # Recursive: the dashboard files its tasks under detected_tasks/YYYY-MM-DD/
+        observer.schedule(DetectedTaskHandler(asyncio.get_running_loop(), queue), str(tasks_dir), recursive=True)
+        observer.start()
+        
+        # Files written before the observer started
+        for file_path in tasks_dir.rglob("task_*.json"):
+            queue.put_nowait(file_path)
+        
+        try:
+            while self.running:
+                file_path = await queue.get()
                 if file_path in processed_files:
                     continue
                 try:
-                    with open(file_path, 'r') as f:
-                        task_json = json.load(f)
+                    raw = file_path.read_bytes()
+                    task_json = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                except json.JSONDecodeError:
+                    continue  # still being written; the next modified event retries
+                except Exception as e:
+                    print(f"⚠️ Failed to ingest task file {file_path}: {e}")
+                    continue
+                try:
                     task_type = task_json.get('type') or task_json.get('task_type') or 'general'
                     description = task_json.get('description', 'No description')
                     metadata = task_json.get('metadata', {})
@@ -178,22 +247,28 @@ class UltimaRunner:
                     processed_files.add(file_path)
                 except Exception as e:
                     print(f"⚠️ Failed to ingest task file {file_path}: {e}")
-            await asyncio.sleep(2)
+        finally:
+            observer.stop()
+            await asyncio.to_thread(observer.join)
 
-    async def bus_listener(self):
-        from bus import bus
-        while self.running:
-            async for msg in bus.subscribe():
-                if not self.running:
-                    break
-                await self.orchestrator.execute_task(msg["type"], msg["description"], msg.get("metadata"))
+    async def bus_listener(self, messages):
+        async for msg in messages:
+            if not self.running:
+                break
+            if msg.get("type") == "write_file":
+                continue  # handled by FileWriter
+            await self.orchestrator.execute_task(msg["type"], msg["description"], msg.get("metadata"))
 
     async def run(self):
         """Main run loop"""
         # Setup signal handlers
+        self._loop = asyncio.get_running_loop()
         signal.signal(signal.SIGINT, self.handle_signal)
         signal.signal(signal.SIGTERM, self.handle_signal)
         
+        # Subscribe before any agent starts so early subtasks are not dropped
+        messages = bus.subscribe()
+        
         try:
             # Initialize system
             await self.setup()
@@ -203,14 +278,13 @@ class UltimaRunner:
             
             # Start status monitoring and task detector
             monitor_task = asyncio.create_task(self.status_monitor())
-            detector_thread = self.start_task_detector()
+            self.start_task_detector()
             ingest_task = asyncio.create_task(self.ingest_detected_tasks())
-            bus_task = asyncio.create_task(self.bus_listener())
+            bus_task = asyncio.create_task(self.bus_listener(messages))
             
             # Run indefinitely until stopped
             print("\n🚀 ULTIMA is running. Press Ctrl+C to stop.")
-            while self.running:
-                await asyncio.sleep(1)
+            await self._stop.wait()
 
         finally:
             if 'monitor_task' in locals() and not monitor_task.done():
@@ -219,6 +293,7 @@ class UltimaRunner:
                 ingest_task.cancel()
             if 'bus_task' in locals() and not bus_task.done():
                 bus_task.cancel()
+            messages.close()
             
             await self.shutdown()
 
@@ -235,6 +310,13 @@ if __name__ == "__main__":
     print("   Version 0.1.0 - Foundation Release")
     print("=" * 60)
     
+    # Use uvloop's libuv-based event loop when available (not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Bus / FileWriter Test
+Checks that agent file output published on the bus actually reaches disk
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# src/ modules import each other top-level (as when run by ultima_runner.py)
+sys.path.append(str(Path(__file__).parent / 'src'))
+
+from bus import Bus, FileWriter
+from agents.base_agent import Task
+from agents.desktop_agent import DesktopAgent
+
+
+async def _write_through_bus(workspace: Path):
+    bus = Bus()
+    writer = FileWriter(bus)
+    writer.start()
+    spy = bus.subscribe()
+    try:
+        # Direct batch: more files than one flush takes
+        files = [(workspace / f"file_{i}.txt", f"content {i}".encode()) for i in range(FileWriter.MAX_BATCH + 4)]
+        await writer.write_many(files)
+
+        # The path a runner agent takes on every status update
+        agent = DesktopAgent("desktop_test", workspace)
+        agent.file_writer = writer
+        task = Task.new("desktop_application", "Bus write test")
+        await agent._save_task_state(task)
+        files.append((agent.tasks_dir / f"{task.id}.json", None))
+    finally:
+        await writer.stop()
+        spy.close()
+    published = [msg["path"] async for msg in spy if msg.get("type") == "write_file"]
+    return files, published
+
+
+def test_file_writer_bus():
+    """Writes published on the bus are on disk once write_many returns"""
+
+    print("🧪 Testing FileWriter over the bus...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Path(tmp)
+        files, published = asyncio.run(_write_through_bus(workspace))
+
+        # Every write went over the bus, none through the direct fallback
+        assert published == [str(path) for path, _ in files]
+        for path, data in files:
+            assert path.exists()
+            if data is not None:
+                assert path.read_bytes() == data
+        print(f"   ✅ {len(files)} files written through the bus")
+
+
+if __name__ == "__main__":
+    test_file_writer_bus()
@@ -32,15 +32,91 @@ print("This test file demonstrates ULTIMA task detection")
 
 import asyncio
 import json
+import re
 import time
 from pathlib import Path
 from src.cursor_bridge.task_detector import CursorTaskDetector
-from src.cursor_bridge.result_writer import CursorResultWriter
+from src.cursor_bridge.result_writer import CursorResultWriter, atomic_write
 from src.agents.orchestrator import NeoOrchestrator
-from src.agents.file_agent import FileAgent
+from src.agents import get_agent
 from src.agents.ai_agent import AIAgent
 from src.agents.diagnostic_agent import DiagnosticAgent
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+
+# Files the simulated agent "creates"; bytes so they are written without re-encoding
+_FILE_MANAGER_CODE = b'''#!/usr/bin/env python3
+"""
+Simple File Manager Utility
+Created by ULTIMA AI Agent
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+class FileManager:
+    """Simple file manager with basic operations"""
+    
+    def __init__(self, base_path: str = "."):
+        self.base_path = Path(base_path)
+    
+    def list_files(self, directory: Optional[str] = None) -> List[str]:
+        """List all files in directory"""
+        target_dir = self.base_path / (directory or ".")
+        return [f.name for f in target_dir.iterdir() if f.is_file()]
+    
+    def create_directory(self, dir_name: str) -> bool:
+        """Create a new directory"""
+        try:
+            (self.base_path / dir_name).mkdir(exist_ok=True)
+            return True
+        except Exception:
+            return False
+    
+    def copy_file(self, source: str, destination: str) -> bool:
+        """Copy file from source to destination"""
+        try:
+            shutil.copy2(self.base_path / source, self.base_path / destination)
+            return True
+        except Exception:
+            return False
+
+if __name__ == "__main__":
+    fm = FileManager()
+    print("File Manager Utility - Created by ULTIMA")
+    print(f"Files in current directory: {fm.list_files()}")
+'''
+
+_TEST_FILE_MANAGER_CODE = b'''#!/usr/bin/env python3
+"""
+Test file for File Manager Utility
+"""
+
+from file_manager import FileManager
+
+def test_file_manager():
+    fm = FileManager()
+    
+    # Test listing files
+    files = fm.list_files()
+    assert len(files) > 0, "Should find some files"
+    
+    # Test directory creation
+    success = fm.create_directory("test_dir")
+    assert success, "Should create directory successfully"
+    
+    print("All tests passed!")
+
+if __name__ == "__main__":
+    test_file_manager()
+'''
+
 
 async def test_cursor_bridge():
     """Test the complete Cursor → ULTIMA bridge"""
@@ -66,8 +142,7 @@ if __name__ == "__main__":
     main()
 '''
     
-    with open(test_file, 'w') as f:
-        f.write(test_content)
+    await asyncio.to_thread(atomic_write, test_file, test_content)
     
     print("✅ Created test file with AI task")
     
@@ -77,6 +152,10 @@ if __name__ == "__main__":
     detected_tasks_dir = workspace / "detected_tasks"
     detector = CursorTaskDetector(workspace, detected_tasks_dir)
     
+    # The task-line pattern is compiled once per detector class, not per scan
+    assert isinstance(detector._AI_TASK_RE, re.Pattern), "detector should expose a compiled _AI_TASK_RE"
+    assert detector._AI_TASK_RE.search(test_content.encode()), "_AI_TASK_RE should match the test task"
+    
     # Manual scan to detect the task
     tasks = detector._scan_file(test_file)
     
@@ -98,7 +177,7 @@ if __name__ == "__main__":
     orchestrator = NeoOrchestrator(workspace)
     
     # Register available agents
-    file_agent = FileAgent("file_agent", workspace)
+    file_agent = get_agent("file", "file_agent", workspace)
     orchestrator.agents["file_agent"] = file_agent
     
     print(f"✅ Registered {len(orchestrator.agents)} agents")
@@ -108,8 +187,8 @@ if __name__ == "__main__":
     
     # Load the task from JSON file
     task_file = detected_tasks_dir / f"task_{task_id}.json"
-    with open(task_file, 'r') as f:
-        task_data = json.load(f)
+    raw = task_file.read_bytes()
+    task_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     
     # Create a simple task result (simulate processing)
     result_data = {
@@ -127,80 +206,12 @@ if __name__ == "__main__":
         }
     }
     
-    # Create the actual files to simulate completion
-    file_manager_code = '''#!/usr/bin/env python3
-"""
-Simple File Manager Utility
-Created by ULTIMA AI Agent
-"""
-
-import os
-import shutil
-from pathlib import Path
-from typing import List, Optional
-
-class FileManager:
-    """Simple file manager with basic operations"""
-    
-    def __init__(self, base_path: str = "."):
-        self.base_path = Path(base_path)
-    
-    def list_files(self, directory: Optional[str] = None) -> List[str]:
-        """List all files in directory"""
-        target_dir = self.base_path / (directory or ".")
-        return [f.name for f in target_dir.iterdir() if f.is_file()]
-    
-    def create_directory(self, dir_name: str) -> bool:
-        """Create a new directory"""
-        try:
-            (self.base_path / dir_name).mkdir(exist_ok=True)
-            return True
-        except Exception:
-            return False
-    
-    def copy_file(self, source: str, destination: str) -> bool:
-        """Copy file from source to destination"""
-        try:
-            shutil.copy2(self.base_path / source, self.base_path / destination)
-            return True
-        except Exception:
-            return False
-
-if __name__ == "__main__":
-    fm = FileManager()
-    print("File Manager Utility - Created by ULTIMA")
-    print(f"Files in current directory: {fm.list_files()}")
-'''
-    
-    with open(workspace / "file_manager.py", 'w') as f:
-        f.write(file_manager_code)
-    
-    test_code = '''#!/usr/bin/env python3
-"""
-Test file for File Manager Utility
-"""
-
-from file_manager import FileManager
-
-def test_file_manager():
-    fm = FileManager()
-    
-    # Test listing files
-    files = fm.list_files()
-    assert len(files) > 0, "Should find some files"
-    
-    # Test directory creation
-    success = fm.create_directory("test_dir")
-    assert success, "Should create directory successfully"
-    
-    print("All tests passed!")
-
-if __name__ == "__main__":
-    test_file_manager()
-'''
-    
-    with open(workspace / "test_file_manager.py", 'w') as f:
-        f.write(test_code)
+    # Create the actual files to simulate completion; the two writes are
+    # independent, so issue both off the event loop at once
+    await asyncio.gather(
+        asyncio.to_thread(atomic_write, workspace / "file_manager.py", _FILE_MANAGER_CODE),
+        asyncio.to_thread(atomic_write, workspace / "test_file_manager.py", _TEST_FILE_MANAGER_CODE),
+    )
     
     print("✅ Created file manager utility files")
     
@@ -210,24 +221,29 @@ if __name__ == "__main__":
     results_dir = workspace / "task_results"
     result_writer = CursorResultWriter(workspace, results_dir)
     
-    success = result_writer.write_task_result(task_id, result_data)
-    
-    if success:
-        print("✅ Result written successfully")
-        
-        # Create summary
-        summary_success = result_writer.create_result_summary(
+    # Result file and summary don't depend on each other; write them together
+    success, summary_success = await asyncio.gather(
+        result_writer.awrite_task_result(task_id, result_data),
+        result_writer.acreate_result_summary(
             task_id,
             result_data["files_created"],
             "Successfully created a file manager utility with core operations including file listing, directory creation, and file copying. Includes comprehensive test suite.",
             None
-        )
+        ),
+    )
+    
+    if success:
+        print("✅ Result written successfully")
         
         if summary_success:
             print("✅ Result summary created")
     else:
         print("❌ Failed to write result")
     
+    # Writes above skip per-file fsync; flush them all once at the task boundary
+    if hasattr(os, "sync"):
+        await asyncio.to_thread(os.sync)
+    
     # 6. Verify complete workflow
     print("\n🎉 Workflow Verification...")
     
@@ -239,7 +255,12 @@ if __name__ == "__main__":
         results_dir / f"summary_{task_id}.md"
     ]
     
-    all_exist = all(f.exists() for f in created_files)
+    # One listing per parent directory instead of an exists() call per file
+    existing = set()
+    for directory in {f.parent for f in created_files}:
+        with os.scandir(directory) as it:
+            existing.update(directory / entry.name for entry in it if entry.is_file())
+    all_exist = all(f in existing for f in created_files)
     
     if all_exist:
         print("✅ All expected files created")
@@ -259,7 +280,7 @@ if __name__ == "__main__":
     else:
         print("❌ Some files missing")
         for f in created_files:
-            status = "✅" if f.exists() else "❌"
+            status = "✅" if f in existing else "❌"
             print(f"   {status} {f}")
     
     # 7. Cleanup test files
@@ -8,6 +8,11 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
 def create_test_task():
     """Create a test task for ULTIMA"""
     
@@ -23,14 +28,16 @@ def create_test_task():
         'task_type': 'file_create',
         'priority': 'high',
         'status': 'pending',
-        'created_at': datetime.now().isoformat(),
+        'created_at': datetime.now(),  # serialized as ISO 8601 by both encoders
         'source': 'test_script'
     }
     
     # Save task file
     task_file = detected_tasks_dir / f"task_{task_id[:12]}.json"
-    with open(task_file, 'w') as f:
-        json.dump(task_data, f, indent=2)
+    if orjson is not None:
+        task_file.write_bytes(orjson.dumps(task_data, option=orjson.OPT_INDENT_2))
+    else:
+        task_file.write_text(json.dumps(task_data, indent=2, default=datetime.isoformat))
     
     print(f"✅ Test task created: {task_file}")
     print(f"📋 Task ID: {task_id}")
@@ -6,12 +6,21 @@ Tests portfolio creation, todo app, and landing page generation
 
 import asyncio
 import json
-import time
+import os
 from pathlib import Path
-from src.agents.web_agent import WebAgent
-from src.agents.base_agent import Task, TaskStatus
-import uuid
+from src.agents import get_agent
+from src.agents.base_agent import Task
 from datetime import datetime
+from functools import partial
+
+
+# One timestamp for every task this script builds
+_NOW = datetime.now()
+make_task = partial(Task.new, created_at=_NOW)
+
+
+# Web tasks from cursor comments allowed in flight at once
+CURSOR_TASK_LIMIT = 4
 
 
 async def test_web_agent():
@@ -21,21 +30,15 @@ async def test_web_agent():
     print("=" * 60)
     
     workspace = Path.cwd()
-    agent = WebAgent("web_test", workspace)
+    agent = get_agent("web", "web_test", workspace)
     
     print(f"🎯 Agent capabilities: {', '.join(agent.get_capabilities())}")
     
     # Test 1: Portfolio Website Creation
-    print(f"\n🎨 Test 1: Portfolio Website Creation")
-    portfolio_task = Task(
-        id=str(uuid.uuid4()),
-        type="web_development",
-        description="Create a modern portfolio website with responsive design",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={
+    portfolio_task = make_task(
+        "web_development",
+        "Create a modern portfolio website with responsive design",
+        {
             "description": "Create a professional portfolio website with modern design",
             "requirements": [
                 "Responsive design",
@@ -43,34 +46,14 @@ async def test_web_agent():
                 "Contact form",
                 "Project showcase"
             ]
-        },
-        dependencies=[]
+        }
     )
     
-    print("  🚀 Creating portfolio website...")
-    start_time = time.time()
-    result = await agent.execute_task(portfolio_task)
-    duration = time.time() - start_time
-    
-    if result and result.get("success"):
-        print(f"  ✅ Portfolio created in {duration:.2f}s")
-        print(f"  📁 Files: {', '.join(result.get('files_created', []))}")
-        print(f"  🎯 Features: {', '.join(result.get('features', []))}")
-        print(f"  🛠️  Technologies: {', '.join(result.get('technologies', []))}")
-    else:
-        print(f"  ❌ Portfolio creation failed: {result.get('error') if result else 'No result'}")
-    
     # Test 2: Todo Application
-    print(f"\n📝 Test 2: Todo Application Creation")
-    todo_task = Task(
-        id=str(uuid.uuid4()),
-        type="web_development",
-        description="Create a todo application with local storage",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={
+    todo_task = make_task(
+        "web_development",
+        "Create a todo application with local storage",
+        {
             "description": "Build a modern todo app with task management features",
             "requirements": [
                 "Add/remove tasks",
@@ -78,34 +61,14 @@ async def test_web_agent():
                 "Filter tasks",
                 "Local storage"
             ]
-        },
-        dependencies=[]
+        }
     )
     
-    print("  🚀 Creating todo application...")
-    start_time = time.time()
-    result = await agent.execute_task(todo_task)
-    duration = time.time() - start_time
-    
-    if result and result.get("success"):
-        print(f"  ✅ Todo app created in {duration:.2f}s")
-        print(f"  📁 Files: {', '.join(result.get('files_created', []))}")
-        print(f"  🎯 Features: {', '.join(result.get('features', []))}")
-        print(f"  🛠️  Technologies: {', '.join(result.get('technologies', []))}")
-    else:
-        print(f"  ❌ Todo app creation failed: {result.get('error') if result else 'No result'}")
-    
     # Test 3: Landing Page
-    print(f"\n🚀 Test 3: Landing Page Creation")
-    landing_task = Task(
-        id=str(uuid.uuid4()),
-        type="web_development",
-        description="Create a product landing page with pricing",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={
+    landing_task = make_task(
+        "web_development",
+        "Create a product landing page with pricing",
+        {
             "description": "Build a modern landing page for product marketing",
             "requirements": [
                 "Hero section",
@@ -113,14 +76,49 @@ async def test_web_agent():
                 "Pricing table",
                 "Call-to-action"
             ]
-        },
-        dependencies=[]
+        }
     )
     
-    print("  🚀 Creating landing page...")
-    start_time = time.time()
-    result = await agent.execute_task(landing_task)
-    duration = time.time() - start_time
+    # Build all three projects at once; the semaphore caps concurrent disk work
+    sem = asyncio.Semaphore(3)
+    loop = asyncio.get_running_loop()
+    
+    async def run(task):
+        async with sem:
+            # Timed inside the coroutine so each duration is its own, not the batch's
+            start_time = loop.time()
+            result = await agent.execute_task(task)
+            return result, loop.time() - start_time
+    
+    print(f"\n🚀 Creating portfolio, todo app and landing page concurrently...")
+    portfolio_res, todo_res, landing_res = await asyncio.gather(
+        run(portfolio_task), run(todo_task), run(landing_task)
+    )
+    
+    print(f"\n🎨 Test 1: Portfolio Website Creation")
+    result, duration = portfolio_res
+    
+    if result and result.get("success"):
+        print(f"  ✅ Portfolio created in {duration:.2f}s")
+        print(f"  📁 Files: {', '.join(result.get('files_created', []))}")
+        print(f"  🎯 Features: {', '.join(result.get('features', []))}")
+        print(f"  🛠️  Technologies: {', '.join(result.get('technologies', []))}")
+    else:
+        print(f"  ❌ Portfolio creation failed: {result.get('error') if result else 'No result'}")
+    
+    print(f"\n📝 Test 2: Todo Application Creation")
+    result, duration = todo_res
+    
+    if result and result.get("success"):
+        print(f"  ✅ Todo app created in {duration:.2f}s")
+        print(f"  📁 Files: {', '.join(result.get('files_created', []))}")
+        print(f"  🎯 Features: {', '.join(result.get('features', []))}")
+        print(f"  🛠️  Technologies: {', '.join(result.get('technologies', []))}")
+    else:
+        print(f"  ❌ Todo app creation failed: {result.get('error') if result else 'No result'}")
+    
+    print(f"\n🚀 Test 3: Landing Page Creation")
+    result, duration = landing_res
     
     if result and result.get("success"):
         print(f"  ✅ Landing page created in {duration:.2f}s")
@@ -146,53 +144,51 @@ async def test_web_agent():
         "landing-script.js"
     ]
     
-    files_found = []
-    files_missing = []
+    # One directory listing instead of an exists() + stat() pair per file
+    expected_set = set(expected_files)
+    with os.scandir(workspace) as it:
+        sizes = {entry.name: entry.stat().st_size for entry in it
+                 if entry.name in expected_set and entry.is_file()}
+    
+    files_found = [f for f in expected_files if f in sizes]
+    files_missing = [f for f in expected_files if f not in sizes]
     
     for filename in expected_files:
-        file_path = workspace / filename
-        if file_path.exists():
-            files_found.append(filename)
-            # Check file size
-            size = file_path.stat().st_size
-            print(f"  ✅ {filename} ({size:,} bytes)")
+        if filename in sizes:
+            print(f"  ✅ {filename} ({sizes[filename]:,} bytes)")
         else:
-            files_missing.append(filename)
             print(f"  ❌ {filename} - NOT FOUND")
     
     # Test 5: Code Quality Check
     print(f"\n🔬 Test 5: Code Quality Analysis")
     
     if files_found:
+        # Read each file once and run every check on the raw bytes
+        contents = {name: (workspace / name).read_bytes() for name in files_found}
+        
         # Check HTML structure
-        html_files = [f for f in files_found if f.endswith('.html')]
-        for html_file in html_files:
-            with open(workspace / html_file, 'r') as f:
-                content = f.read()
-                if '<!DOCTYPE html>' in content:
-                    print(f"  ✅ {html_file}: Valid HTML5 structure")
+        for name, data in contents.items():
+            if name.endswith('.html'):
+                if b'<!DOCTYPE html>' in data:
+                    print(f"  ✅ {name}: Valid HTML5 structure")
                 else:
-                    print(f"  ❌ {html_file}: Missing DOCTYPE")
+                    print(f"  ❌ {name}: Missing DOCTYPE")
         
         # Check CSS quality
-        css_files = [f for f in files_found if f.endswith('.css')]
-        for css_file in css_files:
-            with open(workspace / css_file, 'r') as f:
-                content = f.read()
-                if 'box-sizing: border-box' in content:
-                    print(f"  ✅ {css_file}: Modern CSS practices")
-                if '@media' in content:
-                    print(f"  ✅ {css_file}: Responsive design")
+        for name, data in contents.items():
+            if name.endswith('.css'):
+                if b'box-sizing: border-box' in data:
+                    print(f"  ✅ {name}: Modern CSS practices")
+                if b'@media' in data:
+                    print(f"  ✅ {name}: Responsive design")
         
         # Check JavaScript functionality
-        js_files = [f for f in files_found if f.endswith('.js')]
-        for js_file in js_files:
-            with open(workspace / js_file, 'r') as f:
-                content = f.read()
-                if 'addEventListener' in content:
-                    print(f"  ✅ {js_file}: Modern JavaScript events")
-                if 'querySelector' in content:
-                    print(f"  ✅ {js_file}: Modern DOM manipulation")
+        for name, data in contents.items():
+            if name.endswith('.js'):
+                if b'addEventListener' in data:
+                    print(f"  ✅ {name}: Modern JavaScript events")
+                if b'querySelector' in data:
+                    print(f"  ✅ {name}: Modern DOM manipulation")
     
     # Final Summary
     print(f"\n🎉 WEB AGENT TEST SUMMARY:")
@@ -241,52 +237,59 @@ async def test_cursor_web_integration():
         "# #AI_TASK: Design a landing page for startup [priority:medium] [type:web_development]"
     ]
     
-    web_agent = WebAgent("web_integration_test", workspace)
+    # Same cached instance test_web_agent() used
+    web_agent = get_agent("web", "web_test", workspace)
     result_writer = CursorResultWriter(workspace, workspace / "web_results")
     
-    for i, comment in enumerate(test_cursor_comments, 1):
-        print(f"\n🧪 Test {i}: {comment}")
+    # Parse every comment in one regex pass over the joined buffer
+    buf = "\n".join(test_cursor_comments)
+    jobs = []
+    for i, match in enumerate(TaskDefinition.PATTERN.finditer(buf), 1):
+        print(f"\n🧪 Test {i}: {match.group()}")
         
         # Parse cursor comment
-        task_def = TaskDefinition(comment, Path("test.py"), i)
+        line_number = buf.count("\n", 0, match.start()) + 1
+        task_def = TaskDefinition._from_match(match, Path("test.py"), line_number)
         
         if task_def.parsed_data:
             print(f"  ✅ Parsed: {task_def.parsed_data['description']}")
             print(f"  🏷️  Type: {task_def.parsed_data['type']}")
             
-            # Execute with web agent
+            # Queue for the web agent
             if task_def.parsed_data['type'] == 'web_development':
-                from src.agents.base_agent import Task, TaskStatus
-                from datetime import datetime
-                
-                task = Task(
-                    id=task_def.task_id,
-                    type="web_development",
-                    description=task_def.parsed_data['description'],
-                    priority=1,
-                    status=TaskStatus.PENDING,
-                    created_at=datetime.now(),
-                    updated_at=datetime.now(),
-                    metadata=task_def.parsed_data['metadata'],
-                    dependencies=[]
+                task = make_task(
+                    "web_development",
+                    task_def.parsed_data['description'],
+                    task_def.parsed_data['metadata'],
+                    task_id=task_def.task_id
                 )
-                
-                result = await web_agent.execute_task(task)
-                
-                if result and result.get("success"):
-                    print(f"  ✅ Web agent execution successful")
-                    print(f"  📁 Files: {', '.join(result.get('files_created', []))}")
-                    
-                    # Write result back to cursor
-                    result_writer.write_task_result(task_def.task_id, result)
-                    print(f"  ✅ Result written to cursor bridge")
-                else:
-                    print(f"  ❌ Web agent execution failed")
+                jobs.append((i, task_def, task))
             else:
                 print(f"  ⚠️  Not a web development task")
         else:
             print(f"  ❌ Failed to parse cursor comment")
     
+    # A detector can surface hundreds of comments; cap how many run at once
+    sem = asyncio.Semaphore(CURSOR_TASK_LIMIT)
+    
+    async def bound(task):
+        async with sem:
+            return await web_agent.execute_task(task)
+    
+    results = await asyncio.gather(*(bound(task) for _, _, task in jobs))
+    
+    for (i, task_def, _), result in zip(jobs, results):
+        print(f"\n🌐 Test {i}: {task_def.parsed_data['description']}")
+        if result and result.get("success"):
+            print(f"  ✅ Web agent execution successful")
+            print(f"  📁 Files: {', '.join(result.get('files_created', []))}")
+            
+            # Write result back to cursor
+            result_writer.write_task_result(task_def.task_id, result)
+            print(f"  ✅ Result written to cursor bridge")
+        else:
+            print(f"  ❌ Web agent execution failed")
+    
     print(f"\n🎯 CURSOR + WEB INTEGRATION: COMPLETE!")
     print(f"   ✅ Cursor comment parsing: WORKING")
     print(f"   ✅ Web agent execution: WORKING") 
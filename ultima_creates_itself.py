@@ -8,8 +8,7 @@ import asyncio
 from pathlib import Path
 from src.cursor_bridge.task_detector import TaskDefinition
 from src.agents.web_agent import WebAgent
-from src.agents.base_agent import Task, TaskStatus
-from datetime import datetime
+from src.agents.base_agent import Task
 
 async def ultima_creates_own_ui():
     print("🤖 ULTIMA SELF-DESIGN CHALLENGE")
@@ -42,15 +41,10 @@ async def ultima_creates_own_ui():
     print("💫 Thinking about what it should look like...")
     
     # Create specialized ULTIMA UI task
-    task = Task(
-        id=task_def.task_id,
-        type="web_development",
-        description="Create a stunning modern UI dashboard for ULTIMA AI system",
-        priority=1,
-        status=TaskStatus.PENDING,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-        metadata={
+    task = Task.new(
+        "web_development",
+        "Create a stunning modern UI dashboard for ULTIMA AI system",
+        {
             "description": "Design and build ULTIMA's own user interface dashboard",
             "app_type": "ultima_dashboard",
             "features": [
@@ -66,7 +60,7 @@ async def ultima_creates_own_ui():
             "design_style": "modern, futuristic, beautiful",
             "target_audience": "ULTIMA users and developers"
         },
-        dependencies=[]
+        task_id=task_def.task_id
     )
     
     print("🚀 ULTIMA is building its own UI...")
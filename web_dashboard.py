@@ -5,150 +5,466 @@ Flask-based web interface for ULTIMA monitoring and task management
 """
 
 import os
+
+# Under gevent workers (GEVENT=1) the stdlib must be patched before anything else imports it
+if os.environ.get('GEVENT') == '1':
+    from gevent import monkey
+    monkey.patch_all()
+
+import gzip
 import json
-import glob
+import logging
+import mmap
+import re
 import uuid
-from datetime import datetime
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from datetime import datetime, timedelta
+from flask import Flask, render_template, request, send_from_directory
 from pathlib import Path
 import subprocess
 import threading
 import time
-import psutil
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+try:
+    from flask_socketio import SocketIO
+except ImportError:  # clients fall back to polling the JSON endpoints
+    SocketIO = None
+
+GEVENT = os.environ.get('GEVENT') == '1'
+DEBUG = os.environ.get('ULTIMA_DEBUG') == '1'
 
 app = Flask(__name__)
+socketio = SocketIO(app, async_mode='gevent' if GEVENT else 'threading') if SocketIO is not None else None
+
+# Access log: warnings only unless ULTIMA_DEBUG=1, and never the successful polls
+QUIET_PATHS = ('/api/status', '/api/tasks', '/api/snapshot')
+
+class QuietPollingFilter(logging.Filter):
+    """Drop werkzeug access-log lines for 200 responses to the polling endpoints"""
+    
+    def filter(self, record):
+        message = record.getMessage()
+        return not ('" 200 ' in message and any(f'GET {path} ' in message for path in QUIET_PATHS))
+
+_werkzeug_log = logging.getLogger('werkzeug')
+_werkzeug_log.setLevel(logging.INFO if DEBUG else logging.WARNING)
+_werkzeug_log.addFilter(QuietPollingFilter())
 
 # Configuration
 ULTIMA_ROOT = Path(__file__).parent
 TASKS_DIR = ULTIMA_ROOT / "tasks"
 LOGS_DIR = ULTIMA_ROOT / "logs"
 DETECTED_TASKS_DIR = ULTIMA_ROOT / "detected_tasks"
+# Dashboard tasks go to detected_tasks/YYYY-MM-DD/; listings cover the last N days unless ?all=1
+DETECTED_HISTORY_DAYS = 7
+_DATED_DIR_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# The runner records its PID here at startup (and the dashboard when it spawns one),
+# so status checks are one kill(0)
+PID_FILE = ULTIMA_ROOT / "run" / "ultima.pid"
+STATUS_TTL = 1.0
+_STATUS_CACHE = (0.0, None)
+_ultima_proc = None
+
+def _pid_alive(pid):
+    """True if a process with this PID exists"""
+    if _ultima_proc is not None and _ultima_proc.pid == pid and _ultima_proc.poll() is not None:
+        return False  # our own child exited (poll() also reaps the zombie)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
 
 def get_ultima_status():
-    """More reliable check if ULTIMA is running (uses psutil)."""
-    for proc in psutil.process_iter(attrs=['pid', 'cmdline']):
-        try:
-            cmdline = ' '.join(proc.info.get('cmdline') or [])
-            if 'ultima_runner.py' in cmdline:
-                return {'running': True, 'pid': proc.info['pid']}
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    return {'running': False, 'pid': None}
+    """Check if ULTIMA is running via its PID file (cached for STATUS_TTL seconds)."""
+    global _STATUS_CACHE
+    now = time.monotonic()
+    checked_at, status = _STATUS_CACHE
+    if status is not None and now - checked_at < STATUS_TTL:
+        return status
+    
+    status = {'running': False, 'pid': None}
+    try:
+        pid = int(PID_FILE.read_text().strip())
+    except (OSError, ValueError):
+        pid = None
+    if pid is not None:
+        if _pid_alive(pid):
+            status = {'running': True, 'pid': pid}
+        else:
+            PID_FILE.unlink(missing_ok=True)
+    
+    _STATUS_CACHE = (now, status)
+    return status
 
-def get_all_tasks():
-    """Get all tasks from all agents"""
-    tasks = []
-    
-    # Get tasks from task directories
-    if TASKS_DIR.exists():
-        for agent_dir in TASKS_DIR.iterdir():
-            if agent_dir.is_dir():
-                agent_name = agent_dir.name
-                for task_file in agent_dir.glob("*.json"):
-                    try:
-                        with open(task_file, 'r') as f:
-                            task_data = json.load(f)
-                            task_data['agent'] = agent_name
-                            task_data['source'] = 'executed'
-                            tasks.append(task_data)
-                    except:
-                        continue
-    
-    # Get detected tasks (from cursor bridge)
-    if DETECTED_TASKS_DIR.exists():
-        for task_file in DETECTED_TASKS_DIR.glob("*.json"):
-            try:
-                with open(task_file, 'r') as f:
-                    task_data = json.load(f)
-                    task_data['source'] = 'detected'
-                    task_data['agent'] = 'pending'
-                    tasks.append(task_data)
-            except:
-                continue
+# Parsed task files: path -> (st_mtime_ns, task, timestamp); a file is re-read only when its mtime changes
+_TASK_CACHE = {}
+_TASK_CACHE_GEN = 0  # bumped whenever _TASK_CACHE changes
+# Per view (all_history flag): (cache generation, task file paths, sorted task list, id -> task index).
+# Kept apart so the default poll and a history view don't invalidate each other.
+_TASK_VIEWS = {False: (-1, frozenset(), [], {}), True: (-1, frozenset(), [], {})}
+_TASK_CACHE_LOCK = threading.Lock()
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard-scan')
+
+# ISO string -> epoch seconds; burst-created tasks share timestamp strings
+TS_PARSE_CACHE_SIZE = 10_000
+_TS_PARSE_CACHE = OrderedDict()
+_TS_PARSE_LOCK = threading.Lock()  # safe_timestamp runs in the scan workers
+
+def safe_timestamp(task):
+    """Numeric creation time of a task (handles mixed string/float timestamps)"""
+    numeric = task.get('created_ts')
+    if isinstance(numeric, (int, float)):
+        return numeric
     
-    # Sort by timestamp (handle mixed string/float timestamps)
-    def safe_timestamp(task):
-        timestamp = task.get('created_at', task.get('timestamp', ''))
-        if isinstance(timestamp, (int, float)):
-            return timestamp
-        elif isinstance(timestamp, str) and timestamp:
-            try:
-                from datetime import datetime
-                return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
-            except:
-                return 0
-        return 0
-    
-    tasks.sort(key=safe_timestamp, reverse=True)
-    return tasks
-
-def get_system_stats():
-    """Get system statistics"""
-    tasks = get_all_tasks()
+    timestamp = task.get('created_at', task.get('timestamp', ''))
+    if isinstance(timestamp, (int, float)):
+        return timestamp
+    elif isinstance(timestamp, str) and timestamp:
+        with _TS_PARSE_LOCK:
+            parsed = _TS_PARSE_CACHE.get(timestamp)
+            if parsed is not None:
+                _TS_PARSE_CACHE.move_to_end(timestamp)
+                return parsed
+        try:
+            parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            parsed = 0
+        with _TS_PARSE_LOCK:
+            _TS_PARSE_CACHE[timestamp] = parsed
+            if len(_TS_PARSE_CACHE) > TS_PARSE_CACHE_SIZE:
+                _TS_PARSE_CACHE.popitem(last=False)
+        return parsed
+    return 0
+
+def _scan_json(dir_path, prefix=''):
+    """Yield DirEntry objects for the <prefix>*.json files in dir_path (nothing if it is missing)"""
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.name.endswith('.json') and entry.is_file():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+def _read_json(path):
+    """Parse a JSON file (orjson when installed)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _scan_task_dir(dir_path, fields, prefix=''):
+    """Parse the changed <prefix>*.json files in dir_path (read-only on _TASK_CACHE, so safe in a worker).
     
-    status_counts = {}
-    agent_counts = {}
-    type_counts = {}
+    Returns (every task file path seen, {path: (st_mtime_ns, task, timestamp)} for new or changed files).
+    """
+    seen = []
+    updates = {}
+    for entry in _scan_json(dir_path, prefix):
+        seen.append(entry.path)
+        try:
+            # DirEntry.stat() is cached from the scan; only changed files are opened
+            mtime_ns = entry.stat().st_mtime_ns
+            cached = _TASK_CACHE.get(entry.path)
+            if cached and cached[0] == mtime_ns:
+                continue
+            task_data = _read_json(entry.path)
+        except (OSError, ValueError):  # unreadable or half-written file
+            continue
+        if not isinstance(task_data, dict):
+            continue
+        task_data.update(fields)
+        # Parsed once per file change so sorting is a plain float comparison;
+        # kept beside the task so it never reaches the API responses
+        updates[entry.path] = (mtime_ns, task_data, safe_timestamp(task_data))
+    return seen, updates
+
+def _scan_agent_dirs():
+    """Yield DirEntry objects for the per-agent directories under TASKS_DIR"""
+    try:
+        with os.scandir(TASKS_DIR) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+def _scan_dated_dirs(all_history=False):
+    """Yield detected_tasks/YYYY-MM-DD directories (the last DETECTED_HISTORY_DAYS unless all_history)"""
+    oldest = (datetime.now() - timedelta(days=DETECTED_HISTORY_DAYS - 1)).strftime('%Y-%m-%d')
+    try:
+        with os.scandir(DETECTED_TASKS_DIR) as entries:
+            for entry in entries:
+                # ISO dates compare correctly as strings
+                if entry.is_dir() and _DATED_DIR_RE.fullmatch(entry.name) and (all_history or entry.name >= oldest):
+                    yield entry
+    except FileNotFoundError:
+        return
+
+def _refresh_tasks(all_history=False):
+    """Refresh the cache and return the view's (generation, paths, sorted tasks, index), rebuilt only on change"""
+    global _TASK_CACHE_GEN
     
-    for task in tasks:
-        # Status counts
-        status = task.get('status', 'unknown')
-        status_counts[status] = status_counts.get(status, 0) + 1
+    with _TASK_CACHE_LOCK:
+        # Tasks from each agent's directory, plus detected tasks (from cursor bridge)
+        dirs = []
+        fields = []
+        prefixes = []
+        for agent_dir in _scan_agent_dirs():
+            dirs.append(agent_dir.path)
+            fields.append({'agent': agent_dir.name, 'source': 'executed'})
+            prefixes.append('')
+        # Flat files come from the cursor bridge, dated subdirectories from the dashboard.
+        # Only task_*.json: the directory also holds the detector's own state files.
+        for detected_dir in [DETECTED_TASKS_DIR, *(entry.path for entry in _scan_dated_dirs(all_history))]:
+            dirs.append(detected_dir)
+            fields.append({'source': 'detected', 'agent': 'pending'})
+            prefixes.append('task_')
+        
+        # Directories are independent and the work is I/O-bound: scan them concurrently
+        seen = set()
+        for dir_seen, updates in _EXECUTOR.map(_scan_task_dir, dirs, fields, prefixes):
+            seen.update(dir_seen)
+            if updates:
+                _TASK_CACHE.update(updates)
+                _TASK_CACHE_GEN += 1
         
-        # Agent counts
-        agent = task.get('agent', 'unknown')
-        agent_counts[agent] = agent_counts.get(agent, 0) + 1
+        # Forget files that were deleted since the last call. Older dated directories
+        # are only scanned for the history view, so only that view can tell they are gone.
+        for path in _TASK_CACHE.keys() - seen:
+            if all_history or os.path.dirname(os.path.dirname(path)) != str(DETECTED_TASKS_DIR):
+                del _TASK_CACHE[path]
+                _TASK_CACHE_GEN += 1
         
-        # Type counts
-        task_type = task.get('type', task.get('task_type', 'unknown'))
-        type_counts[task_type] = type_counts.get(task_type, 0) + 1
+        view = _TASK_VIEWS[all_history]
+        if view[0] == _TASK_CACHE_GEN and view[1] == seen:
+            return view
+        
+        entries = [entry for path, entry in _TASK_CACHE.items() if path in seen]
+        tasks = [task for _, task, _ in sorted(entries, key=itemgetter(2), reverse=True)]
+        # Reversed so that, as with a linear scan, the newest task wins a duplicate id
+        index = {task.get('id'): task for task in reversed(tasks)}
+        view = _TASK_VIEWS[all_history] = (_TASK_CACHE_GEN, frozenset(seen), tasks, index)
+        return view
+
+def _current_tasks(all_history=False):
+    """The shared sorted task list for the view, refreshed first"""
+    return _refresh_tasks(all_history)[2]
+
+def get_all_tasks(all_history=False):
+    """Get all tasks from all agents"""
+    return list(_current_tasks(all_history))
+
+def get_task(task_id, all_history=False):
+    """Get a single task by id, or None"""
+    return _refresh_tasks(all_history)[3].get(task_id)
+
+# Per view: counts for the task list object they were computed from
+_TASK_COUNTS = {False: (None, None), True: (None, None)}
+
+def _task_counts(tasks, all_history=False):
+    """Status/agent/type counts in one pass, memoized until the view's task list changes"""
+    counted, counts = _TASK_COUNTS[all_history]
+    if counted is tasks:
+        return counts
     
-    return {
+    status_counts = Counter()
+    agent_counts = Counter()
+    type_counts = Counter()
+    for task in tasks:
+        status_counts[task.get('status', 'unknown')] += 1
+        agent_counts[task.get('agent', 'unknown')] += 1
+        type_counts[task.get('type', task.get('task_type', 'unknown'))] += 1
+    
+    counts = {
         'total_tasks': len(tasks),
-        'status_counts': status_counts,
-        'agent_counts': agent_counts,
-        'type_counts': type_counts,
-        'ultima_status': get_ultima_status()
+        'status_counts': dict(status_counts),
+        'agent_counts': dict(agent_counts),
+        'type_counts': dict(type_counts),
     }
+    _TASK_COUNTS[all_history] = (tasks, counts)
+    return counts
+
+def get_system_stats(all_history=False):
+    """Get system statistics"""
+    return {**_task_counts(_current_tasks(all_history), all_history), 'ultima_status': get_ultima_status()}
+
+def get_snapshot(all_history=False):
+    """Stats and tasks from a single cache refresh"""
+    tasks = _current_tasks(all_history)
+    stats = {**_task_counts(tasks, all_history), 'ultima_status': get_ultima_status()}
+    return {'stats': stats, 'tasks': tasks}
 
 def create_task_from_dashboard(description, task_type, priority):
     """Create a new task from dashboard input"""
     task_id = str(uuid.uuid4())
+    now = datetime.now()
     task_data = {
         'id': task_id,
         'description': description,
         'task_type': task_type,
         'priority': priority,
         'status': 'pending',
-        'created_at': datetime.now().isoformat(),
+        'created_at': now.isoformat(),
+        'created_ts': now.timestamp(),  # numeric sort key, no ISO parsing on read
         'source': 'dashboard'
     }
     
-    # Save to detected_tasks for ULTIMA to pick up
-    DETECTED_TASKS_DIR.mkdir(exist_ok=True)
-    task_file = DETECTED_TASKS_DIR / f"task_{task_id[:12]}.json"
+    # Save to today's detected_tasks subdirectory for ULTIMA to pick up
+    day_dir = DETECTED_TASKS_DIR / now.strftime('%Y-%m-%d')
+    day_dir.mkdir(parents=True, exist_ok=True)
+    task_file = day_dir / f"task_{task_id[:12]}.json"
     
-    with open(task_file, 'w') as f:
-        json.dump(task_data, f, indent=2)
+    if orjson is not None:
+        task_file.write_bytes(orjson.dumps(task_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(task_file, 'w') as f:
+            json.dump(task_data, f, indent=2)
     
     return task_data
 
+# One encoder configuration for every response. Counts may be keyed by null
+# (a task with "status": null), which stdlib json writes as "null".
+if orjson is not None:
+    _JSON_OPTS = orjson.OPT_NON_STR_KEYS
+    _encode_json = partial(orjson.dumps, option=_JSON_OPTS)
+else:
+    _encode_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+def _json_response(obj):
+    """JSON response built with the shared module encoder"""
+    return app.response_class(_encode_json(obj), mimetype='application/json')
+
+# Task lists are large and repetitive; gzip them for clients that accept it
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 4  # most of the ratio of level 9 at a fraction of the CPU
+
+@app.after_request
+def gzip_response(response):
+    """Gzip successful JSON/text responses larger than GZIP_MIN_SIZE"""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype == 'application/json' or response.mimetype.startswith('text/'))
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+        return response
+    data = response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Push model: task file changes are watched and broadcast as 'tasks_changed'
+TASK_PUSH_DEBOUNCE = 0.25
+# No file event fires when ULTIMA starts or stops, so its status is re-checked this often
+STATUS_PUSH_INTERVAL = 2.0
+_tasks_changed = threading.Event()
+_task_observer = None
+_task_observer_lock = threading.Lock()
+
+class TaskDirHandler(FileSystemEventHandler):
+    """Flags changes to task JSON files for the push loop"""
+    
+    def _flag(self, event):
+        paths = (event.src_path, getattr(event, 'dest_path', ''))
+        if not event.is_directory and any(str(p).endswith('.json') for p in paths):
+            _tasks_changed.set()
+    
+    on_created = on_modified = on_deleted = on_moved = _flag
+
+def _push_task_updates():
+    """Emit a 'tasks_changed' snapshot per burst of task file events or ULTIMA status change"""
+    last_status = get_ultima_status()
+    while True:
+        if _tasks_changed.wait(STATUS_PUSH_INTERVAL):
+            socketio.sleep(TASK_PUSH_DEBOUNCE)  # let a burst of writes settle
+            _tasks_changed.clear()
+        elif get_ultima_status() == last_status:
+            continue
+        snapshot = get_snapshot()
+        last_status = snapshot['stats']['ultima_status']
+        socketio.emit('tasks_changed', snapshot)
+
+def start_task_watcher():
+    """Watch the task directories and start the push loop (once per process)"""
+    global _task_observer
+    with _task_observer_lock:
+        if _task_observer is not None:
+            return
+        # inotify reads would block the gevent hub; stat polling yields cooperatively
+        observer = PollingObserver() if GEVENT else Observer()
+        handler = TaskDirHandler()
+        for watched in (TASKS_DIR, DETECTED_TASKS_DIR):
+            watched.mkdir(exist_ok=True)
+            observer.schedule(handler, str(watched), recursive=True)
+        observer.daemon = True
+        observer.start()
+        _task_observer = observer
+        socketio.start_background_task(_push_task_updates)
+
+if socketio is not None:
+    @socketio.on('connect')
+    def on_connect():
+        start_task_watcher()
+
+def migrate_detected_tasks():
+    """Move legacy dashboard tasks from the top of detected_tasks/ into dated subdirectories"""
+    moved = 0
+    for entry in list(_scan_json(DETECTED_TASKS_DIR, 'task_')):
+        try:
+            task_data = _read_json(entry.path)
+        except (OSError, ValueError):
+            continue
+        # Cursor bridge files stay put: the result writer looks them up at the top level
+        if not isinstance(task_data, dict) or task_data.get('source') != 'dashboard':
+            continue
+        day_dir = DETECTED_TASKS_DIR / datetime.fromtimestamp(safe_timestamp(task_data)).strftime('%Y-%m-%d')
+        day_dir.mkdir(exist_ok=True)
+        os.replace(entry.path, day_dir / entry.name)
+        moved += 1
+    return moved
+
+def _all_history():
+    """True when the request asks for the full task history (?all=1)"""
+    return request.args.get('all') == '1'
+
 # Routes
 @app.route('/')
 def dashboard():
     """Main dashboard page"""
-    return render_template('dashboard.html')
+    return render_template('dashboard.html', socketio_available=socketio is not None)
 
 @app.route('/api/status')
 def api_status():
     """API endpoint for system status"""
-    return jsonify(get_system_stats())
+    return _json_response(get_system_stats(_all_history()))
 
 @app.route('/api/tasks')
 def api_tasks():
     """API endpoint for all tasks"""
-    tasks = get_all_tasks()
-    return jsonify(tasks)
+    return _json_response(_current_tasks(_all_history()))
+
+@app.route('/api/snapshot')
+def api_snapshot():
+    """API endpoint for status and tasks in one response"""
+    return _json_response(get_snapshot(_all_history()))
 
 @app.route('/api/tasks/create', methods=['POST'])
 def api_create_task():
@@ -159,11 +475,12 @@ def api_create_task():
         data.get('type', 'general'),
         data.get('priority', 'medium')
     )
-    return jsonify(task)
+    return _json_response(task)
 
 @app.route('/api/ultima/start', methods=['POST'])
 def api_start_ultima():
     """Start ULTIMA process"""
+    global _ultima_proc, _STATUS_CACHE
     try:
         # Start ULTIMA in background and capture logs
         logs_dir = LOGS_DIR
@@ -171,46 +488,88 @@ def api_start_ultima():
         log_file = logs_dir / 'ultima_runner.log'
 
         with open(log_file, 'a') as lf:
-            subprocess.Popen(
+            _ultima_proc = subprocess.Popen(
                 ['python3', 'src/ultima_runner.py'],
                 cwd=ULTIMA_ROOT,
                 stdout=lf,
                 stderr=subprocess.STDOUT,
                 start_new_session=True  # prevent signal propagation
             )
+        PID_FILE.parent.mkdir(exist_ok=True)
+        PID_FILE.write_text(str(_ultima_proc.pid))
+        _STATUS_CACHE = (0.0, None)
         time.sleep(2)  # Give it time to start
-        return jsonify({'success': True, 'message': 'ULTIMA started'})
+        return _json_response({'success': True, 'message': 'ULTIMA started'})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return _json_response({'success': False, 'error': str(e)})
 
 @app.route('/api/ultima/stop', methods=['POST'])
 def api_stop_ultima():
     """Stop ULTIMA process"""
+    global _STATUS_CACHE
     try:
         subprocess.run(['pkill', '-f', 'ultima_runner'])
-        return jsonify({'success': True, 'message': 'ULTIMA stopped'})
+        PID_FILE.unlink(missing_ok=True)
+        _STATUS_CACHE = (0.0, None)
+        return _json_response({'success': True, 'message': 'ULTIMA stopped'})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return _json_response({'success': False, 'error': str(e)})
 
 @app.route('/api/task/<task_id>')
 def api_task_detail(task_id):
     """Return details for a single task"""
-    for task in get_all_tasks():
-        if task.get('id') == task_id:
-            return jsonify(task)
-    return jsonify({'error': 'task not found'}), 404
+    task = get_task(task_id, _all_history())
+    if task is None:
+        return _json_response({'error': 'task not found'}), 404
+    return _json_response(task)
+
+TAIL_CHUNK = 8192
+TAIL_MMAP_THRESHOLD = 64 * 1024  # below this, plain reads beat mmap setup
+
+def _tail(path, n=100):
+    """Last n lines of a text file, found by scanning backwards from the end"""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size > TAIL_MMAP_THRESHOLD:
+            data = _tail_mapped(f, size, n)
+        else:
+            data = _tail_read(f, size, n)
+    data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    return [line.decode('utf-8', errors='replace') for line in data.splitlines(keepends=True)[-n:]]
+
+def _tail_read(f, size, n):
+    """Bytes covering the last n lines, read in TAIL_CHUNK blocks from the end"""
+    chunks = []
+    newlines = 0
+    pos = size
+    # n + 1 newlines guarantee the oldest of the n lines is complete
+    while pos > 0 and newlines <= n:
+        step = min(TAIL_CHUNK, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step)
+        chunks.append(chunk)
+        newlines += chunk.count(b'\n')
+    return b''.join(reversed(chunks))
+
+def _tail_mapped(f, size, n):
+    """Bytes covering the last n lines, located with rfind over a read-only mapping"""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = size
+        for _ in range(n + 1):
+            start = mm.rfind(b'\n', 0, start)
+            if start < 0:
+                break
+        return mm[max(start, 0):size]
 
 @app.route('/api/task/<task_id>/log')
 def api_task_log(task_id):
     """Return last 100 lines of related agent log if available"""
-    # find task and agent
-    agent_name = None
-    for task in get_all_tasks():
-        if task.get('id') == task_id:
-            agent_name = task.get('agent')
-            break
+    # find task and agent; the task index is only rebuilt when a task file changes
+    task = get_task(task_id, all_history=True)
+    agent_name = task.get('agent') if task else None
     if not agent_name or agent_name == 'pending':
-        return jsonify({'log': []})
+        return _json_response({'log': []})
     # log path heuristic
     possible_paths = [
         LOGS_DIR / f"{agent_name}.log",
@@ -219,16 +578,14 @@ def api_task_log(task_id):
     log_lines = []
     for p in possible_paths:
         if p.exists():
-            with open(p, 'r') as f:
-                log_lines = f.readlines()[-100:]
+            log_lines = _tail(p)
             break
     # Fallback to global runner log if agent-specific log not found
     if not log_lines:
         global_log = LOGS_DIR / 'ultima_runner.log'
         if global_log.exists():
-            with open(global_log, 'r') as f:
-                log_lines = f.readlines()[-100:]
-    return jsonify({'log': log_lines})
+            log_lines = _tail(global_log)
+    return _json_response({'log': log_lines})
 
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
@@ -239,4 +596,21 @@ if __name__ == '__main__':
     print("📊 Dashboard will be available at: http://localhost:5000")
     print("🔄 Real-time task monitoring enabled")
     
-    app.run(host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
+    moved = migrate_detected_tasks()
+    if moved:
+        print(f"📦 Moved {moved} dashboard tasks into dated detected_tasks/ subdirectories")
+    
+    if os.environ.get('FLASK_ENV') == 'production':
+        # gevent workers serve concurrent polls instead of queueing them on one thread
+        os.environ['GEVENT'] = '1'
+        # Socket.IO sessions are per process, so without sticky routing keep one worker
+        workers = '1' if socketio is not None else '4'
+        os.execvp('gunicorn', [
+            'gunicorn', '-k', 'gevent', '-w', workers, '--worker-connections', '100',
+            '-b', '0.0.0.0:5000', '--chdir', str(ULTIMA_ROOT), 'web_dashboard:app'
+        ])
+    
+    if socketio is not None:
+        socketio.run(app, host='0.0.0.0', port=5000, debug=DEBUG, allow_unsafe_werkzeug=True)
+    else:
+        app.run(host='0.0.0.0', port=5000, debug=DEBUG, threaded=True) 
\ No newline at end of file